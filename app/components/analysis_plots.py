@@ -1,9 +1,115 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
-
-def sentiment_distribution_plots(df: pd.DataFrame):
-    "Function to plot sentiment distribution as pie and bar plots."
+import plotly.graph_objects as go
+
+from config import plot_webgl_threshold, plot_density_threshold
+from utils.review_aggregates import SCORE_BINS, histogram_median, stats_std, SENTIMENTS
+
+SENTIMENT_COLORS = {'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'}
+
+# Large review sets are summarized on the server so the figure JSON sent to the
+# browser stays the same size however many reviews there are.
+
+# Figures of an analyzed movie only change when its reviews do, so with a
+# `data_key` they are built once and reused by every rerun showing that analysis.
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _cached_figure(data_key: str, name: str, _build) -> go.Figure:
+    return _build()
+
+def _figure(data_key: str, name: str, build) -> go.Figure:
+    """Return `build()`, memoized per (data_key, name) when a data key is given."""
+    if data_key is None:
+        return build()
+    return _cached_figure(data_key, name, build)
+
+def _binned_histogram(values: pd.Series, nbins: int, title: str, color: str) -> go.Figure:
+    """Histogram with bin counts computed in NumPy instead of shipping raw values."""
+    counts, edges = np.histogram(values.to_numpy(dtype=np.float64), bins=nbins)
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_color=color
+    ))
+    fig.update_layout(title=title, bargap=0)
+    return fig
+
+def _box_stats(values: np.ndarray) -> dict:
+    # Tukey box: whiskers at the most extreme values within 1.5 IQR of the quartiles
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    return {
+        'q1': [q1], 'median': [median], 'q3': [q3],
+        'lowerfence': [values[values >= q1 - 1.5 * iqr].min()],
+        'upperfence': [values[values <= q3 + 1.5 * iqr].max()],
+    }
+
+def _quantile_box(df: pd.DataFrame, y: str, title: str, x: str = None, color: str = None) -> go.Figure:
+    """Box plot drawn from precomputed quartiles and fences, one box per `x` group."""
+    fig = go.Figure()
+    groups = df.groupby(x) if x else [(y, df)]
+    for name, group in groups:
+        fig.add_trace(go.Box(
+            name=str(name),
+            x=[str(name)],
+            marker_color=SENTIMENT_COLORS.get(name, color),
+            boxpoints=False,
+            **_box_stats(group[y].to_numpy(dtype=np.float64))
+        ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y, showlegend=bool(x))
+    return fig
+
+def _density_heatmap(df: pd.DataFrame, x: str, y: str, title: str, nbins: int = 50) -> go.Figure:
+    """2D density computed in NumPy, categorical `y` columns get one row per category."""
+    x_values = df[x].to_numpy(dtype=np.float64)
+    x_edges = np.histogram_bin_edges(x_values, bins=nbins)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+
+    if pd.api.types.is_numeric_dtype(df[y]):
+        counts, _, y_edges = np.histogram2d(x_values, df[y].to_numpy(dtype=np.float64), bins=[x_edges, nbins])
+        z, y_labels = counts.T, (y_edges[:-1] + y_edges[1:]) / 2
+    else:
+        y_labels = sorted(df[y].astype(str).unique())
+        z = [np.histogram(x_values[(df[y].astype(str) == label).to_numpy()], bins=x_edges)[0] for label in y_labels]
+
+    fig = go.Figure(go.Heatmap(x=x_centers, y=y_labels, z=z, colorscale='Viridis', colorbar={'title': 'Reviews'}))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+    return fig
+
+def _scatter(df: pd.DataFrame, x: str, y: str, title: str) -> go.Figure:
+    """Sentiment-colored scatter, WebGL without per-point titles or a density map for large sets."""
+    if len(df) > plot_density_threshold:
+        return _density_heatmap(df, x, y, title)
+    if len(df) > plot_webgl_threshold:
+        return px.scatter(df, x=x, y=y, title=title, color='sentiment',
+                          color_discrete_map=SENTIMENT_COLORS, render_mode='webgl')
+    return px.scatter(df, x=x, y=y, title=title, color='sentiment',
+                      color_discrete_map=SENTIMENT_COLORS, hover_data=['title'])
+
+def _sentiment_pie(sentiment_counts: pd.Series) -> go.Figure:
+    return px.pie(
+        values=sentiment_counts.values,
+        names=sentiment_counts.index,
+        title="Distribution of Review Sentiments",
+        color_discrete_map={'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'}
+    )
+
+def _sentiment_bar(sentiment_counts: pd.Series) -> go.Figure:
+    fig = px.bar(
+        x=sentiment_counts.index,
+        y=sentiment_counts.values,
+        title="Sentiment Count",
+        color=sentiment_counts.index,
+        color_discrete_map={'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'}
+    )
+    fig.update_layout(xaxis_title="Sentiment", yaxis_title="Count")
+    return fig
+
+def sentiment_distribution_plots(df: pd.DataFrame, aggregates: dict = None, data_key: str = None):
+    "Function to plot sentiment distribution as pie and bar plots, using stored aggregates when given."
 
     st.subheader("Sentiment Distribution")
 
@@ -16,41 +122,84 @@ def sentiment_distribution_plots(df: pd.DataFrame):
             st.error("The DataFrame must contain a 'sentiment' column.")
             return
 
-        sentiment_counts = df['sentiment'].value_counts()
+        if aggregates:
+            sentiment_counts = pd.Series(aggregates['sentiment_counts'])
+            sentiment_counts = sentiment_counts[sentiment_counts > 0].sort_values(ascending=False)
+        else:
+            sentiment_counts = df['sentiment'].value_counts()
 
         if sentiment_counts.empty:
             st.warning("No sentiment data available to plot.")
             return
 
         # pie chart
-        fig_sentiment = px.pie(
-            values=sentiment_counts.values,
-            names=sentiment_counts.index,
-            title="Distribution of Review Sentiments",
-            color_discrete_map={'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'}
-        )
+        fig_sentiment = _figure(data_key, 'sentiment_pie', lambda: _sentiment_pie(sentiment_counts))
         st.plotly_chart(fig_sentiment, use_container_width=True)
 
         # bar plot
-        fig_bar = px.bar(
-            x=sentiment_counts.index,
-            y=sentiment_counts.values,
-            title="Sentiment Count",
-            color=sentiment_counts.index,
-            color_discrete_map={'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'}
-        )
-        fig_bar.update_layout(xaxis_title="Sentiment", yaxis_title="Count")
+        fig_bar = _figure(data_key, 'sentiment_bar', lambda: _sentiment_bar(sentiment_counts))
         st.plotly_chart(fig_bar, use_container_width=True)
 
     except Exception as e:
         st.error(f"An error occurred while plotting sentiment distribution: {e}")
 
-def sentiment_score_analysis_plots(df: pd.DataFrame):
-    "Function to plot sentiment score distribution, box plot, and display statistics."
+def _score_histogram(df: pd.DataFrame, aggregates: dict = None) -> go.Figure:
+    if aggregates:
+        bin_centers = (SCORE_BINS[:-1] + SCORE_BINS[1:]) / 2
+        fig = px.bar(
+            x=bin_centers,
+            y=aggregates['score_hist'],
+            title="Distribution of Review Scores",
+            color_discrete_sequence=['#4CAF50']
+        )
+        fig.update_traces(width=SCORE_BINS[1] - SCORE_BINS[0])
+    elif len(df) > plot_webgl_threshold:
+        fig = _binned_histogram(df['score'], 20, "Distribution of Review Scores", '#4CAF50')
+    else:
+        fig = px.histogram(
+            df,
+            x='score',
+            nbins=20,
+            title="Distribution of Review Scores",
+            color_discrete_sequence=['#4CAF50']
+        )
+    fig.update_layout(xaxis_title="Score", yaxis_title="Frequency")
+    return fig
+
+def _score_box(df: pd.DataFrame) -> go.Figure:
+    if len(df) > plot_webgl_threshold:
+        return _quantile_box(df, 'score', "Score Distribution (Box Plot)", color='#2196F3')
+    return px.box(
+        df,
+        y='score',
+        title="Score Distribution (Box Plot)",
+        color_discrete_sequence=['#2196F3']
+    )
+
+def _score_metrics(mean: float, median: float, minimum: float, maximum: float, median_label: str = "Median Score"):
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Average Score", f"{mean:.2f}")
+    with col2:
+        st.metric(median_label, f"{median:.2f}")
+    with col3:
+        st.metric("Min Score", f"{minimum:.2f}")
+    with col4:
+        st.metric("Max Score", f"{maximum:.2f}")
+
+def sentiment_score_analysis_plots(df: pd.DataFrame, aggregates: dict = None, data_key: str = None):
+    "Function to plot sentiment score distribution, box plot, and display statistics, using stored aggregates when given."
 
     st.subheader("Score Analysis")
 
     try:
+        if df.empty and aggregates:
+            # rows not loaded, the median is estimated from the stored histogram
+            score_stats = aggregates['score']
+            median = histogram_median(aggregates['score_hist'], SCORE_BINS)
+            _score_metrics(score_stats['mean'], median, score_stats['min'], score_stats['max'], "Median Score (approx.)")
+            return
+
         if df.empty:
             st.warning("The input DataFrame is empty.")
             return
@@ -69,40 +218,48 @@ def sentiment_score_analysis_plots(df: pd.DataFrame):
             return
 
         # score distribution as a histogram
-        fig_hist = px.histogram(
-            df,
-            x='score',
-            nbins=20,
-            title="Distribution of Review Scores",
-            color_discrete_sequence=['#4CAF50']
-        )
-        fig_hist.update_layout(xaxis_title="Score", yaxis_title="Frequency")
+        fig_hist = _figure(data_key, 'score_hist', lambda: _score_histogram(df, aggregates))
         st.plotly_chart(fig_hist, use_container_width=True)
 
         # box plot of scores
-        fig_box = px.box(
-            df,
-            y='score',
-            title="Score Distribution (Box Plot)",
-            color_discrete_sequence=['#2196F3']
-        )
+        fig_box = _figure(data_key, 'score_box', lambda: _score_box(df))
         st.plotly_chart(fig_box, use_container_width=True)
 
-        # score statistics
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("Average Score", f"{df['score'].mean():.2f}")
-        with col2:
-            st.metric("Median Score", f"{df['score'].median():.2f}")
-        with col3:
-            st.metric("Min Score", f"{df['score'].min():.2f}")
-        with col4:
-            st.metric("Max Score", f"{df['score'].max():.2f}")
+        # score statistics, the median needs the rows even when aggregates are stored
+        if aggregates:
+            score_stats = aggregates['score']
+            mean, minimum, maximum = score_stats['mean'], score_stats['min'], score_stats['max']
+        else:
+            mean, minimum, maximum = df['score'].mean(), df['score'].min(), df['score'].max()
+        _score_metrics(mean, df['score'].median(), minimum, maximum)
 
     except Exception as e:
         st.error(f"An error occurred during score analysis: {e}")
 
-def sentiment_vs_score_plots(df: pd.DataFrame):
+def _score_by_sentiment_box(df: pd.DataFrame) -> go.Figure:
+    if len(df) > plot_webgl_threshold:
+        return _quantile_box(df, 'score', "Score Distribution by Sentiment", x='sentiment')
+    return px.box(
+        df,
+        x='sentiment',
+        y='score',
+        title="Score Distribution by Sentiment",
+        color='sentiment',
+        color_discrete_map={'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'}
+    )
+
+def _average_score_bar(df: pd.DataFrame) -> go.Figure:
+    avg_scores = df.groupby('sentiment')['score'].mean().reset_index()
+    return px.bar(
+        avg_scores,
+        x='sentiment',
+        y='score',
+        title="Average Score by Sentiment",
+        color='sentiment',
+        color_discrete_map={'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'}
+    )
+
+def sentiment_vs_score_plots(df: pd.DataFrame, data_key: str = None):
     "Function to compare sentiment and score via plots."
 
     st.subheader("Sentiment vs Score Analysis")
@@ -128,44 +285,48 @@ def sentiment_vs_score_plots(df: pd.DataFrame):
             return
 
         # scatter plot of socre with sentiment 
-        fig_scatter = px.scatter(
-            df,
-            x='score',
-            y='sentiment',
-            title="Sentiment vs Score Distribution",
-            color='sentiment',
-            color_discrete_map={'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'},
-            hover_data=['title']
-        )
+        fig_scatter = _figure(data_key, 'sentiment_scatter',
+                              lambda: _scatter(df, 'score', 'sentiment', "Sentiment vs Score Distribution"))
         st.plotly_chart(fig_scatter, use_container_width=True)
 
         # box plot by sentiment
-        fig_box_sentiment = px.box(
-            df,
-            x='sentiment',
-            y='score',
-            title="Score Distribution by Sentiment",
-            color='sentiment',
-            color_discrete_map={'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'}
-        )
+        fig_box_sentiment = _figure(data_key, 'sentiment_box', lambda: _score_by_sentiment_box(df))
         st.plotly_chart(fig_box_sentiment, use_container_width=True)
 
         # average score by sentiment
-        avg_scores = df.groupby('sentiment')['score'].mean().reset_index()
-        fig_avg = px.bar(
-            avg_scores,
-            x='sentiment',
-            y='score',
-            title="Average Score by Sentiment",
-            color='sentiment',
-            color_discrete_map={'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'}
-        )
+        fig_avg = _figure(data_key, 'sentiment_avg', lambda: _average_score_bar(df))
         st.plotly_chart(fig_avg, use_container_width=True)
 
     except Exception as e:
         st.error(f"An error occurred during sentiment vs score analysis: {e}")
 
-def content_analysis_plots(df: pd.DataFrame):
+def _length_histogram(df: pd.DataFrame) -> go.Figure:
+    if len(df) > plot_webgl_threshold:
+        fig = _binned_histogram(df['content_length'], 30, "Distribution of Review Content Length", '#FF9800')
+    else:
+        fig = px.histogram(
+            df,
+            x='content_length',
+            title="Distribution of Review Content Length",
+            nbins=30,
+            color_discrete_sequence=['#FF9800']
+        )
+    fig.update_layout(xaxis_title="Content Length (characters)", yaxis_title="Frequency")
+    return fig
+
+def _length_by_sentiment_box(df: pd.DataFrame) -> go.Figure:
+    if len(df) > plot_webgl_threshold:
+        return _quantile_box(df, 'content_length', "Content Length by Sentiment", x='sentiment')
+    return px.box(
+        df,
+        x='sentiment',
+        y='content_length',
+        title="Content Length by Sentiment",
+        color='sentiment',
+        color_discrete_map={'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'}
+    )
+
+def content_analysis_plots(df: pd.DataFrame, data_key: str = None):
     "Function to analyze content length and its relationship with sentiment and score."
 
     st.subheader("Content Analysis")
@@ -199,86 +360,96 @@ def content_analysis_plots(df: pd.DataFrame):
         df['title_length'] = df['title'].str.len()
 
         # Plot 1: Content length distribution
-        fig_length = px.histogram(
-            df,
-            x='content_length',
-            title="Distribution of Review Content Length",
-            nbins=30,
-            color_discrete_sequence=['#FF9800']
-        )
-        fig_length.update_layout(xaxis_title="Content Length (characters)", yaxis_title="Frequency")
+        fig_length = _figure(data_key, 'length_hist', lambda: _length_histogram(df))
         st.plotly_chart(fig_length, use_container_width=True)
 
         # Plot 2: Box plot of content length by sentiment
-        fig_length_sentiment = px.box(
-            df,
-            x='sentiment',
-            y='content_length',
-            title="Content Length by Sentiment",
-            color='sentiment',
-            color_discrete_map={'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'}
-        )
+        fig_length_sentiment = _figure(data_key, 'length_box', lambda: _length_by_sentiment_box(df))
         st.plotly_chart(fig_length_sentiment, use_container_width=True)
 
         # Plot 3: Scatter plot of content length vs score
-        fig_length_score = px.scatter(
-            df,
-            x='content_length',
-            y='score',
-            title="Content Length vs Score",
-            color='sentiment',
-            color_discrete_map={'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'},
-            hover_data=['title']
-        )
+        fig_length_score = _figure(data_key, 'length_scatter',
+                                   lambda: _scatter(df, 'content_length', 'score', "Content Length vs Score"))
         st.plotly_chart(fig_length_score, use_container_width=True)
 
     except Exception as e:
         st.error(f"An error occurred during content analysis: {e}")
 
-def summary_statistics(df: pd.DataFrame):
+def _summary_from_aggregates(aggregates: dict) -> pd.DataFrame:
+    """Per-sentiment summary table with the same columns as the DataFrame groupby."""
+    rows = []
+    for label in SENTIMENTS:
+        group = aggregates['by_sentiment'][label]
+        score, length = group['score'], group['content_length']
+        if score['count'] == 0:
+            continue
+        rows.append({
+            'sentiment': label,
+            'score_count': score['count'],
+            'score_mean': score['mean'],
+            'score_std': stats_std(score),
+            'score_min': score['min'],
+            'score_max': score['max'],
+            'content_length_mean': length['mean'],
+            'content_length_std': stats_std(length),
+        })
+    return pd.DataFrame(rows).sort_values('sentiment').round(2).reset_index(drop=True)
+
+def summary_statistics(df: pd.DataFrame, aggregates: dict = None):
     st.subheader("Summary Statistics")
 
     try:
-        if df.empty:
-            st.warning("The input DataFrame is empty.")
-            return
-
-        required_cols = ['sentiment', 'score']
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        if missing_cols:
-            st.error(f"Missing required column(s): {', '.join(missing_cols)}")
-            return
-
-        # valid dtypes
-        df = df.copy()
-        df['content_length'] = df['content'].str.len()
-        df['score'] = pd.to_numeric(df['score'], errors='coerce')
-        df['content_length'] = pd.to_numeric(df['content_length'], errors='coerce')
-        df = df.dropna(subset=['sentiment', 'score', 'content_length'])
+        if aggregates:
+            # stored aggregates already hold everything, no need to touch the reviews
+            summary_stats = _summary_from_aggregates(aggregates)
+            total_reviews = aggregates['count']
+            pos = aggregates['sentiment_counts']['POSITIVE']
+            neg = aggregates['sentiment_counts']['NEGATIVE']
+            neu = aggregates['sentiment_counts']['NEUTRAL']
+            avg_score = aggregates['score']['mean']
+        else:
+            if df.empty:
+                st.warning("The input DataFrame is empty.")
+                return
+
+            required_cols = ['sentiment', 'score']
+            missing_cols = [col for col in required_cols if col not in df.columns]
+            if missing_cols:
+                st.error(f"Missing required column(s): {', '.join(missing_cols)}")
+                return
+
+            # valid dtypes
+            df = df.copy()
+            df['content_length'] = df['content'].str.len()
+            df['score'] = pd.to_numeric(df['score'], errors='coerce')
+            df['content_length'] = pd.to_numeric(df['content_length'], errors='coerce')
+            df = df.dropna(subset=['sentiment', 'score', 'content_length'])
+
+            if df.empty:
+                st.warning("No valid data after cleaning.")
+                return
+
+            # summary table
+            summary_stats = df.groupby('sentiment').agg({
+                'score': ['count', 'mean', 'std', 'min', 'max'],
+                'content_length': ['mean', 'std']
+            }).round(2)
+
+            # flattenning multi-index columns
+            summary_stats.columns = ['_'.join(col).strip() for col in summary_stats.columns]
+            summary_stats = summary_stats.reset_index()
+
+            total_reviews = len(df)
+            pos = len(df[df['sentiment'] == 'POSITIVE'])
+            neg = len(df[df['sentiment'] == 'NEGATIVE'])
+            neu = len(df[df['sentiment'] == 'NEUTRAL'])
+            avg_score = df['score'].mean()
 
-        if df.empty:
-            st.warning("No valid data after cleaning.")
-            return
-
-        # summary table
-        summary_stats = df.groupby('sentiment').agg({
-            'score': ['count', 'mean', 'std', 'min', 'max'],
-            'content_length': ['mean', 'std']
-        }).round(2)
-
-        # flattenning multi-index columns
-        summary_stats.columns = ['_'.join(col).strip() for col in summary_stats.columns]
-        summary_stats = summary_stats.reset_index()
         st.dataframe(summary_stats, use_container_width=True)
 
         # vverall Metrics
         st.subheader("Overall Metrics")
-        total_reviews = len(df)
-        pos = len(df[df['sentiment'] == 'POSITIVE'])
-        neg = len(df[df['sentiment'] == 'NEGATIVE'])
-        neu = len(df[df['sentiment'] == 'NEUTRAL'])
         pos_pct = (pos / total_reviews) * 100 if total_reviews > 0 else 0
-        avg_score = df['score'].mean()
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -293,3 +464,112 @@ def summary_statistics(df: pd.DataFrame):
 
     except Exception as e:
         st.error(f"An error occurred during summary statistics calculation: {e}")
+
+def comparison_plots(summary_df: pd.DataFrame):
+    "Function to compare the sentiment of several movies side by side from their aggregates."
+
+    st.subheader("Movie Comparison")
+
+    try:
+        if summary_df.empty:
+            st.warning("No movies to compare.")
+            return
+
+        st.dataframe(summary_df.round(2), use_container_width=True, hide_index=True)
+
+        # sentiment shares per movie
+        shares = summary_df.melt(
+            id_vars='movie',
+            value_vars=['positive_pct', 'negative_pct', 'neutral_pct'],
+            var_name='sentiment',
+            value_name='percentage'
+        )
+        shares['sentiment'] = shares['sentiment'].str.replace('_pct', '').str.upper()
+        fig_shares = px.bar(
+            shares,
+            x='movie',
+            y='percentage',
+            color='sentiment',
+            barmode='group',
+            title="Sentiment Share by Movie",
+            color_discrete_map={'POSITIVE': '#2E8B57', 'NEGATIVE': '#DC143C', 'NEUTRAL': '#FFD700'}
+        )
+        fig_shares.update_layout(xaxis_title="Movie", yaxis_title="Reviews (%)")
+        st.plotly_chart(fig_shares, use_container_width=True)
+
+        # average score per movie with one standard deviation
+        fig_avg = px.bar(
+            summary_df,
+            x='movie',
+            y='score_mean',
+            error_y='score_std',
+            title="Average Score by Movie",
+            color_discrete_sequence=['#2196F3']
+        )
+        fig_avg.update_layout(xaxis_title="Movie", yaxis_title="Average Score")
+        st.plotly_chart(fig_avg, use_container_width=True)
+
+    except Exception as e:
+        st.error(f"An error occurred during movie comparison: {e}")
+
+def group_share_plots(summary_df: pd.DataFrame, by: str):
+    "Function to plot positive share and average score per group (genre, director or decade)."
+
+    try:
+        if summary_df.empty:
+            st.warning(f"No data to group by {by}.")
+            return
+
+        summary_df = summary_df.sort_values(by if by == 'decade' else 'positive_share', ascending=by == 'decade')
+
+        fig_share = px.bar(
+            summary_df,
+            x=by,
+            y='positive_share',
+            title=f"Positive Review Share by {by.title()}",
+            hover_data=['movies', 'reviews', 'score_mean'],
+            color_discrete_sequence=['#2E8B57']
+        )
+        fig_share.update_layout(xaxis_title=by.title(), yaxis_title="Positive Share", yaxis_tickformat='.0%')
+        st.plotly_chart(fig_share, use_container_width=True)
+
+    except Exception as e:
+        st.error(f"An error occurred while plotting the {by} summary: {e}")
+
+def _term_bar(table: pd.DataFrame, label: str) -> go.Figure:
+    fig = px.bar(
+        table.iloc[::-1],
+        x='count',
+        y='term',
+        orientation='h',
+        title=label.title(),
+        color_discrete_sequence=[SENTIMENT_COLORS[label]]
+    )
+    fig.update_layout(xaxis_title="Count", yaxis_title=None, height=450)
+    return fig
+
+def term_frequency_plots(terms: dict, data_key: str = None):
+    "Function to plot the most frequent words and bigrams for each sentiment."
+
+    st.subheader("Top Terms by Sentiment")
+
+    try:
+        if not terms:
+            st.warning("No terms available to plot.")
+            return
+
+        labels = [label for label in SENTIMENTS if label in terms]
+        for kind, title in [('unigrams', "Words"), ('bigrams', "Bigrams")]:
+            st.markdown(f"**Most Frequent {title}**")
+            columns = st.columns(len(labels))
+            for column, label in zip(columns, labels):
+                table = terms[label][kind]
+                with column:
+                    if table.empty:
+                        st.caption(f"No {title.lower()} for {label.lower()} reviews.")
+                        continue
+                    fig = _figure(data_key, f'terms_{kind}_{label}', lambda: _term_bar(table, label))
+                    st.plotly_chart(fig, use_container_width=True)
+
+    except Exception as e:
+        st.error(f"An error occurred during term frequency analysis: {e}")
@@ -1,6 +1,8 @@
 import streamlit as st
 import emoji
 
+from utils.image_cache import cached_thumbnail
+
 # css style is added in the single file named style.css
 
 def display_movie_card(movie_data):
@@ -15,9 +17,12 @@ def display_movie_card(movie_data):
         
         with col1:
 
-            # movie poster
-            if movie_data.get('Poster') and movie_data.get('Poster') != 'N/A':
-                st.image(movie_data.get('Poster'), width=200)
+            # movie poster, served from the local thumbnail cache (falls back to the remote URL)
+            poster_url = movie_data.get('Poster')
+            if not poster_url or poster_url == 'N/A':
+                poster_url = movie_data.get('Cover Image')
+            if poster_url and poster_url != 'N/A':
+                st.image(cached_thumbnail(poster_url) or poster_url, width=200)
         
         with col2:
 
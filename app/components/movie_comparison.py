@@ -0,0 +1,65 @@
+import streamlit as st
+import pandas as pd
+import emoji
+
+from utils.analysis_store import analyze_titles
+from utils.movie_api import with_details
+from utils.review_aggregates import stats_std
+from components.analysis_plots import comparison_plots
+
+def _movie_label(movie: dict) -> str:
+    return f"{movie.get('Title', 'Unknown Title')} ({movie.get('Year', 'N/A')})"
+
+def comparison_summary(movies: list[dict], analyses: dict) -> pd.DataFrame:
+    """Build one summary row per analyzed movie from its stored aggregates."""
+    rows = []
+    for movie in movies:
+        analysis = analyses.get(movie.get('imdbID'))
+        if not analysis:
+            continue
+        aggregates = analysis['aggregates']
+        total = aggregates['count']
+        counts = aggregates['sentiment_counts']
+        rows.append({
+            'movie': _movie_label(movie),
+            'reviews': total,
+            'positive_pct': 100 * counts['POSITIVE'] / total if total else 0,
+            'negative_pct': 100 * counts['NEGATIVE'] / total if total else 0,
+            'neutral_pct': 100 * counts['NEUTRAL'] / total if total else 0,
+            'score_mean': aggregates['score']['mean'],
+            'score_std': stats_std(aggregates['score']),
+        })
+    return pd.DataFrame(rows)
+
+@st.fragment
+def movie_comparison_section(movies: list[dict]):
+    """Let the user pick several search results and compare their review sentiment."""
+
+    with st.expander(f"{emoji.emojize(':bar_chart:', language='alias')} Compare Movies"):
+        candidates = [movie for movie in movies if movie.get('imdbID')]
+        selected = st.multiselect(
+            "Select movies to compare:",
+            options=range(len(candidates)),
+            format_func=lambda i: _movie_label(candidates[i]),
+            key="comparison_select"
+        )
+
+        if st.button("Compare Selected Movies", key="compare_button", disabled=len(selected) < 2):
+            selected_movies = [with_details(candidates[i]) for i in selected]
+            try:
+                with st.spinner("Fetching and analyzing reviews..."):
+                    analyses = analyze_titles(selected_movies)
+                    for imdb_id, analysis in analyses.items():
+                        st.session_state.full_analysis[imdb_id] = analysis
+                        st.session_state.reviews[imdb_id] = analysis['reviews']
+                st.session_state.comparison = [movie['imdbID'] for movie in selected_movies]
+            except Exception as e:
+                st.error(f"Failed to compare movies: {e}")
+            else:
+                # the analysis panel outside this fragment may show one of the new analyses
+                st.rerun()
+
+        # comparison stays visible across reruns until the selection is compared again
+        compared = [m for m in candidates if m.get('imdbID') in st.session_state.comparison]
+        if compared:
+            comparison_plots(comparison_summary(compared, st.session_state.full_analysis))
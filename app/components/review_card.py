@@ -1,6 +1,10 @@
+import html
 import streamlit as st
 import emoji
 
+from utils.predict_sentiment import explain
+from utils.analysis_store import store_explanation
+
 def get_sentiment_style(sentiment):
     """Return (color, emoji) tuple based on sentiment label."""
     sentiment = sentiment.upper()
@@ -32,8 +36,58 @@ def get_score_emoji(score):
     return emoji.emojize(":question:", language='alias')
 
 
-def display_review_card(review):
-    """Render a styled review card in Streamlit showing sentiment, score, and optional rating."""
+def highlight_tokens(explanation: dict) -> str:
+    """Return HTML with each word shaded green (raised the score) or red (lowered it)."""
+    weights = explanation['weights']
+    max_weight = max((abs(w) for w in weights), default=0) or 1.0
+
+    spans = []
+    for token, weight in zip(explanation['tokens'], weights):
+        alpha = min(abs(weight) / max_weight, 1.0) * 0.8
+        color = f"rgba(46, 139, 87, {alpha:.2f})" if weight > 0 else f"rgba(220, 20, 60, {alpha:.2f})"
+        spans.append(
+            f'<span title="{weight:+.4f}" style="background-color: {color}; border-radius: 3px; padding: 0 2px;">'
+            f'{html.escape(token)}</span>'
+        )
+    return " ".join(spans)
+
+def display_review_explanation(review, imdb_id=None):
+    """Render the occlusion attribution of a review, computed once and kept in the review dict.
+
+    With `imdb_id`, a new explanation is also saved into the title's stored analysis.
+    """
+
+    if 'explanation' not in review:
+        with st.spinner("Explaining score..."):
+            review['explanation'] = explain(review)
+        if imdb_id:
+            try:
+                store_explanation(imdb_id, review)
+            except OSError as e:
+                print(f"[Warning] Could not store explanation for {imdb_id}: {e}")
+
+    explanation = review['explanation']
+    if not explanation['tokens']:
+        st.info("Nothing to explain for an empty review.")
+        return
+
+    note = f" (words masked in groups of {explanation['span']})" if explanation['span'] > 1 else ""
+    st.markdown(
+        f"""
+        <div style="background-color: #1e1e1e; border-radius: 10px; padding: 1rem; margin-bottom: 1rem; line-height: 1.9;">
+            <p style="margin: 0 0 0.5rem 0; color: #aaa;">Green words raised the score, red words lowered it{note}.</p>
+            <p style="margin: 0; color: #fff;">{highlight_tokens(explanation)}</p>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+def display_review_card(review, key=None, imdb_id=None):
+    """Render a styled review card in Streamlit showing sentiment, score, and optional rating.
+
+    If `key` is given, the card gets an "Explain score" toggle that highlights the words
+    that drove the score, stored with the analysis of `imdb_id` if given.
+    """
 
     try:
         heading = review['title']
@@ -57,7 +111,10 @@ def display_review_card(review):
                 """,
                 unsafe_allow_html=True
             )
-    except (KeyError, TypeError, ValueError) as e:
+
+            if key is not None and st.toggle("Explain score", key=key):
+                display_review_explanation(review, imdb_id)
+    except (KeyError, TypeError, ValueError, RuntimeError) as e:
         st.error(f"Error displaying review: {e}")
         
 # For testing
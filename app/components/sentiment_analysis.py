@@ -3,16 +3,21 @@ import pandas as pd
 import emoji
 
 from config import *
-from utils.movie_api import fetch_movie_data
+from utils.movie_api import search_movies, with_details
+from utils.title_index import title_index_available, complete_titles
+from utils.query_log import log_event
+from utils.profiling import profiled, profile_interaction
 from components.review_card import display_review_card
 from components.movie_card import display_movie_card
-from utils.review_scrapper import get_reviews
-from utils.predict_sentiment import predict
+from components.movie_comparison import movie_comparison_section
+from utils.analysis_store import load_analysis, refresh_analysis
 from components.analysis_plots import sentiment_distribution_plots
 from components.analysis_plots import sentiment_score_analysis_plots
 from components.analysis_plots import sentiment_vs_score_plots
 from components.analysis_plots import content_analysis_plots
 from components.analysis_plots import summary_statistics
+from components.analysis_plots import term_frequency_plots
+from utils.term_frequency import top_terms
 
 # For Testing
 # Initialize session state
@@ -25,7 +30,26 @@ from components.analysis_plots import summary_statistics
 # if 'full_analysis' not in st.session_state:
 #     st.session_state.full_analysis = {}
 
-def display_review_analysis(reviews: list):
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _cached_top_terms(data_key: str, _reviews: list) -> dict:
+    return top_terms(_reviews)
+
+def analysis_key(imdb_id: str, analysis: dict, reviews: list) -> str:
+    """Identifies one version of a movie's scored reviews, it changes whenever they are refreshed."""
+    last_crawl = analysis.get('last_crawl') if analysis else None
+    return f"{imdb_id}@{last_crawl}:{len(reviews)}"
+
+def display_review_analysis(reviews: list, aggregates: dict = None, data_key: str = None, imdb_id: str = None):
+    """
+    Review cards and analysis tabs of one movie.
+
+    Args:
+        reviews (list): Scored review dicts.
+        aggregates (dict): Stored aggregates of the reviews, recomputed from the reviews if None.
+        data_key (str): Version of the reviews from `analysis_key`, figures and top terms are
+            built once per key and reused by later reruns. Nothing is memoized if None.
+        imdb_id (str): Title of the reviews, review explanations are saved with its stored analysis.
+    """
 
     # type check
     if not isinstance(reviews, list) or not reviews:
@@ -46,7 +70,10 @@ def display_review_analysis(reviews: list):
         return
 
     # sentiment counts
-    sentiment_counts = df['sentiment'].value_counts()
+    if aggregates:
+        sentiment_counts = pd.Series(aggregates['sentiment_counts'])
+    else:
+        sentiment_counts = df['sentiment'].value_counts()
 
     # tabs
     tabs = st.tabs([
@@ -55,6 +82,7 @@ def display_review_analysis(reviews: list):
         "Score Analysis",
         "Sentiment vs Score",
         "Content Analysis",
+        "Top Terms",
         "Summary Stats"
     ])
 
@@ -70,40 +98,47 @@ def display_review_analysis(reviews: list):
             st.metric("Neutral", sentiment_counts.get('NEUTRAL', 0))
 
         st.markdown("**Movie Reviews:**")
-        for review in reviews:
+        for i, review in enumerate(reviews):
             try:
-                display_review_card(review)
+                display_review_card(review, key=f"explain_{i}_{review.get('review_id', '')}", imdb_id=imdb_id)
             except Exception as e:
                 st.warning(f"Skipped a review due to error: {e}")
 
-    # Tab 02 to 06 for analysis 
+    # Tab 02 to 07 for analysis 
     try:
         with tabs[1]:
-            sentiment_distribution_plots(df)
+            sentiment_distribution_plots(df, aggregates, data_key)
     except Exception as e:
         st.error(f"Error in Sentiment Distribution tab: {e}")
 
     try:
         with tabs[2]:
-            sentiment_score_analysis_plots(df)
+            sentiment_score_analysis_plots(df, aggregates, data_key)
     except Exception as e:
         st.error(f"Error in Score Analysis tab: {e}")
 
     try:
         with tabs[3]:
-            sentiment_vs_score_plots(df)
+            sentiment_vs_score_plots(df, data_key)
     except Exception as e:
         st.error(f"Error in Sentiment vs Score tab: {e}")
 
     try:
         with tabs[4]:
-            content_analysis_plots(df)
+            content_analysis_plots(df, data_key)
     except Exception as e:
         st.error(f"Error in Content Analysis tab: {e}")
 
     try:
         with tabs[5]:
-            summary_statistics(df)
+            terms = top_terms(reviews) if data_key is None else _cached_top_terms(data_key, reviews)
+            term_frequency_plots(terms, data_key)
+    except Exception as e:
+        st.error(f"Error in Top Terms tab: {e}")
+
+    try:
+        with tabs[6]:
+            summary_statistics(df, aggregates)
     except Exception as e:
         st.error(f"Error in Summary Statistics tab: {e}")
 
@@ -115,14 +150,30 @@ def sentiment_analysis_tab():
         placeholder="e.g., The Matrix, Inception, Avatar...", 
         key="search_input"
     )
+
+    # autocomplete from the offline title index, a click searches the suggested title
+    if search_query and title_index_enabled and title_index_available():
+        try:
+            suggestions = list(dict.fromkeys(
+                s['Title'] for s in complete_titles(search_query, k=8) if s['Title'].lower() != search_query.lower()
+            ))[:5]
+        except Exception as e:
+            suggestions = []
+            print(f"[Warning] Title suggestions failed: {e}")
+        if suggestions:
+            columns = st.columns(len(suggestions))
+            for column, title in zip(columns, suggestions):
+                column.button(title, key=f"suggest_{title}", on_click=_use_suggestion, args=(title,))
     
     if search_query and search_query != st.session_state.last_search_query:
         try:
             with st.spinner("Searching for movies..."):
-                total_movie_results = fetch_movie_data(search_query)
+                total_movie_results = search_movies(search_query)
                 st.session_state.movies = total_movie_results
                 st.session_state.current_page = 1
                 st.session_state.last_search_query = search_query
+                log_event('search', query=search_query,
+                          imdbIDs=[m.get('imdbID') for m in (total_movie_results or [])[:3]])
 
             if total_movie_results:
                 st.success(f"Found {len(total_movie_results)} movies matching '{search_query}'")
@@ -134,59 +185,104 @@ def sentiment_analysis_tab():
     
     # search results
     if st.session_state.movies:
-        st.markdown(f"### {emoji.emojize(':movie_camera:', language='alias')} Search Results")
+        search_results_section()
 
-        # pages to switch between movies
-        total_movies = len(st.session_state.movies)
-        total_pages = min(total_movies, 10) # only showing at most 10 pages 
-        
-        col1, col2, col3 = st.columns([4, 4, 1])
-        with col1:
-            if st.button(f"{emoji.emojize(':arrow_backward:', language='alias')} Previous") and st.session_state.current_page > 1:
-                st.session_state.current_page -= 1
-                st.rerun()  # immediate rerun so display updates
-        with col2:
-            st.write(f"Page {st.session_state.current_page} of {total_pages}")
-        with col3:
-            if st.button(f"{emoji.emojize(':arrow_forward:', language='alias')} Next") and st.session_state.current_page < total_pages:
-                st.session_state.current_page += 1
-                st.rerun()  # immediate rerun so display updates
+def shown_imdb_id() -> str:
+    """imdbID of the search result on the current page, None before a search."""
+    movies = st.session_state.get('movies') or []
+    page = st.session_state.get('current_page', 1)
+    return movies[page - 1].get('imdbID') if 0 < page <= len(movies) else None
+
+def _use_suggestion(title: str):
+    st.session_state.search_input = title
+
+def _change_page(step: int, total_pages: int):
+    # runs before the fragment rerun, so the new page renders in the same pass
+    st.session_state.current_page = min(max(st.session_state.current_page + step, 1), total_pages)
+
+@st.fragment
+@profile_interaction('page', imdb_id=shown_imdb_id)
+def search_results_section():
+    """Pager, comparison, movie card and analysis panel, rerun on their own when paging."""
+
+    st.markdown(f"### {emoji.emojize(':movie_camera:', language='alias')} Search Results")
+
+    # pages to switch between movies
+    total_movies = len(st.session_state.movies)
+    total_pages = min(total_movies, 10) # only showing at most 10 pages 
+    
+    col1, col2, col3 = st.columns([4, 4, 1])
+    with col1:
+        st.button(f"{emoji.emojize(':arrow_backward:', language='alias')} Previous",
+                  on_click=_change_page, args=(-1, total_pages))
+    with col2:
+        st.write(f"Page {st.session_state.current_page} of {total_pages}")
+    with col3:
+        st.button(f"{emoji.emojize(':arrow_forward:', language='alias')} Next",
+                  on_click=_change_page, args=(1, total_pages))
 
-        # print(st.session_state.current_page)
-        currunt_movie_index = st.session_state.current_page - 1
-        movie = st.session_state.movies[currunt_movie_index]
+    # side-by-side comparison of several search results
+    try:
+        movie_comparison_section(st.session_state.movies)
+    except Exception as e:
+        st.error(f"Failed to display movie comparison: {e}")
+
+    currunt_movie_index = st.session_state.current_page - 1
+    # title index results are fetched from OMDb only when their page is shown
+    movie = with_details(st.session_state.movies[currunt_movie_index])
+    st.session_state.movies[currunt_movie_index] = movie
+
+    # display movie
+    try:
+        display_movie_card(movie)
+    except Exception as e:
+        st.error(f"Failed to display movie card: {e}")
+
+    review_analysis_panel(movie)
+
+@st.fragment
+@profile_interaction('panel', imdb_id=lambda movie: movie.get('imdbID'))
+def review_analysis_panel(movie: dict):
+    """Analyze button and results of one movie, review card toggles only rerun this panel."""
+
+    # stored analysis from an earlier session is shown without rescraping
+    imdb_id = movie.get('imdbID')
+    if imdb_id not in st.session_state.full_analysis:
+        stored = load_analysis(imdb_id)
+        log_event('view', imdbID=imdb_id, hit=stored is not None)
+        if stored:
+            st.session_state.full_analysis[imdb_id] = stored
+            st.session_state.reviews[imdb_id] = stored['reviews']
 
-        # display movie
+    analysis = st.session_state.full_analysis.get(imdb_id)
+    button_label = "Refresh Review Analysis" if analysis else "Perform Review Analysis"
+
+    if st.button(f"{emoji.emojize(':mag:', language='alias')} {button_label}", key="analyze_button"):
         try:
-            display_movie_card(movie)
+            with st.spinner("Fetching reviews..."), profiled('analysis', imdb_id):
+                log_event('analyze', imdbID=imdb_id)
+                analysis, new_count = refresh_analysis(imdb_id, analysis, movie)
+                st.session_state.full_analysis[imdb_id] = analysis
+                st.session_state.reviews[imdb_id] = analysis['reviews']
+            st.success(f"Reviews fetched successfully! {new_count} new review(s) analyzed.")
+            st.rerun(scope="fragment")
         except Exception as e:
-            st.error(f"Failed to display movie card: {e}")
-        
+            st.error(f"Failed to fetch reviews: {e}")
 
-        if st.button(f"{emoji.emojize(':mag:', language='alias')} Perform Review Analysis", key="analyze_button"):
-            try:
-                with st.spinner("Fetching reviews..."):
-                    reviews = get_reviews(movie.get('imdbID'))
-                    if reviews == None or len(reviews) == 0:
-                        raise ValueError("No reviews to fetch!")
-                    reviews = predict(reviews)
-                    st.session_state.reviews[movie.get('imdbID')] = reviews
-                st.success("Reviews fetched successfully!")
-                st.rerun()
-            except Exception as e:
-                st.error(f"Failed to fetch reviews: {e}")
-
-        
-        # display reviews analysis if reviews fetched
-        if movie.get('imdbID') in st.session_state.get('reviews', {}):
+    
+    # display reviews analysis if reviews fetched
+    if imdb_id in st.session_state.get('reviews', {}):
 
-            st.markdown(f"#### {emoji.emojize(':memo:', language='alias')} Detailed Review Sentiment Analysis")
-            reviews = st.session_state.reviews[movie.get('imdbID')]
+        st.markdown(f"#### {emoji.emojize(':memo:', language='alias')} Detailed Review Sentiment Analysis")
+        if analysis and analysis.get('last_crawl'):
+            st.caption(f"Last updated: {analysis['last_crawl'].replace('T', ' ')}")
+        reviews = st.session_state.reviews[imdb_id]
+        aggregates = analysis.get('aggregates') if analysis else None
 
-            try:
-                display_review_analysis(reviews)
-            except Exception as e:
-                st.error(f"Error while performing review analysis: {e}")
+        try:
+            display_review_analysis(reviews, aggregates, analysis_key(imdb_id, analysis, reviews), imdb_id)
+        except Exception as e:
+            st.error(f"Error while performing review analysis: {e}")
 
 # For testing
 if __name__ == '__main__':
@@ -0,0 +1,60 @@
+import streamlit as st
+import emoji
+
+from utils.review_warehouse import indexed_movies, query_movies, positive_share, group_summary
+from components.analysis_plots import group_share_plots
+
+def warehouse_insights_tab():
+    """Cross-movie sentiment views answered from the local review warehouse."""
+
+    st.markdown(f"## {emoji.emojize(':card_file_box:', language='alias')} Cross-Movie Insights")
+
+    movies = indexed_movies()  # cached with the query index, not re-read on every rerun
+    if movies.empty:
+        st.info("No analyzed movies yet. Analyze a few movies in the search tab to populate the warehouse.")
+        return
+
+    # filter options come from the stored movies
+    all_genres = sorted({g for genres in movies['genres'] for g in genres})
+    years = movies['year'].dropna().astype(int)
+
+    col1, col2, col3 = st.columns([2, 2, 2])
+    with col1:
+        genres = st.multiselect("Genre", all_genres, key="insights_genres")
+    with col2:
+        if years.empty:
+            year_range = None
+        elif years.min() == years.max():
+            year_range = (int(years.min()), int(years.max()))
+            st.write(f"Year: {year_range[0]}")
+        else:
+            year_range = st.slider("Year", int(years.min()), int(years.max()), (int(years.min()), int(years.max())), key="insights_years")
+    with col3:
+        director = st.text_input("Director", placeholder="e.g., Christopher Nolan", key="insights_director")
+
+    selected = query_movies(genres=genres, year_range=year_range, director=director.strip() or None)
+    totals = positive_share(selected)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Movies", totals['movies'])
+    with col2:
+        st.metric("Reviews", totals['reviews'])
+    with col3:
+        share = totals['positive_share']
+        st.metric("Positive Share", f"{share * 100:.1f}%" if share == share else "N/A")
+
+    if selected.empty:
+        st.warning("No analyzed movies match these filters.")
+        return
+
+    st.dataframe(
+        selected[['title', 'year', 'review_count', 'positive_share', 'score_mean', 'imdbRating']].round(2),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    group_tabs = st.tabs(["By Genre", "By Decade", "By Director"])
+    for tab, by in zip(group_tabs, ['genre', 'decade', 'director']):
+        with tab:
+            group_share_plots(group_summary(selected, by), by)
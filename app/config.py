@@ -1,13 +1,20 @@
-def search_movie_url(movie_id: str, spoiler_free: bool = False) -> str:
-    """Construct IMDb review URL for a movie with optional spoiler filtering."""
+def search_movie_url(movie_id: str, spoiler_free: bool = False, newest_first: bool = False,
+                     pagination_key: str = None) -> str:
+    """Construct IMDb review URL for a movie with optional spoiler filtering, newest-first sorting and paging."""
 
     # handling the case if movie_id is not provided
     if not movie_id:
         return "ERROR"
     
     base_url = f'https://www.imdb.com/title/{movie_id}/reviews/'
-    spoiler_tag = '?spoilers=EXCLUDE'
-    return base_url + spoiler_tag if spoiler_free else base_url
+    params = []
+    if spoiler_free:
+        params.append('spoilers=EXCLUDE')
+    if newest_first:
+        params.append('sort=submissionDate&dir=desc')
+    if pagination_key:
+        params.append(f'paginationKey={pagination_key}')
+    return base_url + '?' + '&'.join(params) if params else base_url
 
 # IMDb review scraping configuration
 review_container_class = 'ipc-list-card__content'
@@ -24,4 +31,97 @@ class_names = {
     'rating': 'ipc-rating-star--rating',
     'title': 'ipc-title__text ipc-title__text--reduced',
     'content': 'ipc-html-content-inner-div',
+    'date': 'review-date',
 }
+review_date_format = '%b %d, %Y'
+# 'Load more' element whose data-key attribute is the pagination key of the next page
+review_pagination_class = 'load-more-data'
+
+# Movie search: 'omdb' uses OMDb's search endpoint, 'cinemagoer' searches IMDb through
+# Cinemagoer (optional dependency). Either way details are looked up by imdbID and cached
+movie_search_backend = 'omdb'
+omdb_url = 'https://www.omdbapi.com/'
+omdb_cache_dir = './cache/omdb'
+omdb_cache_ttl_hours = 24 * 7
+# Titles OMDb did not return details for are not looked up again for this long
+omdb_failure_ttl_seconds = 600
+search_max_results = 10
+
+# Offline title index (built with `python -m scripts.build_title_index`), searched
+# locally instead of OMDb when present; only the selected titles are fetched from OMDb
+title_index_dir = './cache/title_index'
+title_index_enabled = True
+
+# Stored per-title analysis (scored reviews + mergeable aggregates)
+analysis_cache_dir = './cache/analysis'
+# A refresh pages through the newest reviews until it reaches one it has seen, at most this many pages
+refresh_max_pages = 20
+
+# Analysis plots: above `plot_webgl_threshold` reviews scatter plots use WebGL and
+# histograms/box plots are binned server-side, above `plot_density_threshold`
+# scatter plots are replaced by a server-side 2D density
+plot_webgl_threshold = 1000
+plot_density_threshold = 10000
+
+# Columnar store of every analyzed movie (metadata, scored reviews, aggregates)
+warehouse_dir = './cache/warehouse'
+
+# Review pages scraped in parallel when comparing several movies
+scrape_max_workers = 8
+
+# Selectable sentiment models, the app scores with `sentiment_model`. The student is a
+# compact conv model distilled from the RNN with `python -m scripts.distill_student`
+sentiment_models = {
+    'rnn': './models/imdb_rnn_model_02_split_80_20.keras',
+    'student': './models/imdb_student_conv.keras',
+}
+sentiment_model = 'rnn'
+
+# Cascade inference: a hashed n-gram linear model scores every review first,
+# only reviews whose score falls inside the band are sent to the RNN
+fast_model_path = './models/imdb_linear_ngram.npz'
+cascade_enabled = False
+cascade_band = (0.25, 0.75)
+
+# Upper bound on the memory one model call in predict() may use, larger batches are chunked
+predict_memory_budget_mb = 256
+
+# Reviews longer than the RNN's 1000-token window are scored on their full text by running
+# the SimpleRNN over `long_review_chunk_len`-token chunks, carrying its state between chunks.
+# Off, or for models without a single SimpleRNN, they are truncated to their last 1000 tokens
+long_review_chunking = True
+long_review_chunk_len = 250
+
+# Inference worker: one thread owns the models and scores the requests of every session,
+# requests arriving within the batch window are merged into a single model batch
+inference_batching = True
+inference_batch_window_ms = 10
+inference_max_batch_reviews = 1024
+
+# Occlusion explanations: at most this many word spans are masked per review
+explain_token_budget = 64
+
+# Local poster/cover thumbnails, least recently used files are evicted above the size cap
+image_cache_dir = './cache/images'
+image_cache_max_bytes = 50 * 1024 * 1024
+thumbnail_width = 200
+# Posters that could not be fetched are not retried for this long
+image_failure_ttl_seconds = 600
+
+# Searches, first views and analyses of titles, read by the pre-warmer to pick popular titles
+query_log_path = './cache/query_log.jsonl'
+
+# Cache pre-warming (`python -m scripts.prewarm`, or a background thread in the app when
+# enabled): titles whose analysis is older than `prewarm_stale_hours` are refreshed,
+# at most `prewarm_titles_per_minute` at a time to stay polite to OMDb and IMDb
+prewarm_enabled = False
+prewarm_interval_minutes = 60
+prewarm_stale_hours = 12
+prewarm_titles_per_minute = 6
+prewarm_top_titles = 200
+
+# On-demand profiling (REELFEEL_PROFILE=1 or `?profile=1`): each rerun or analysis job
+# writes a flame graph, collapsed stacks and a top-N function/allocation report here
+profile_dir = './cache/profiles'
+profile_sample_interval_ms = 5
+profile_top_n = 25
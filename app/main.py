@@ -3,7 +3,10 @@ import emoji
 from config import *
 
 from components.about import about_app_tab
-from components.sentiment_analysis import sentiment_analysis_tab
+from components.sentiment_analysis import sentiment_analysis_tab, shown_imdb_id
+from components.warehouse_insights import warehouse_insights_tab
+from utils.prewarm import start_prewarm_thread
+from utils.profiling import profile_interaction
 
 # Page configuration
 st.set_page_config(
@@ -13,11 +16,21 @@ st.set_page_config(
     initial_sidebar_state="expanded"    
 )
 
-# Loading the style
-with open('./app/style.css', 'r') as file:
-    style = file.read()
+# Loading the style, read from disk once per process
+@st.cache_data(show_spinner=False)
+def load_style(path: str) -> str:
+    with open(path, 'r') as file:
+        return file.read()
 
-st.markdown(f"<style>{style}</style>", unsafe_allow_html=True)
+st.markdown(f"<style>{load_style('./app/style.css')}</style>", unsafe_allow_html=True)
+
+# one pre-warm thread per server process, shared by every session
+@st.cache_resource(show_spinner=False)
+def prewarm_thread():
+    return start_prewarm_thread()
+
+if prewarm_enabled:
+    prewarm_thread()
 
 # session state initialization 
 for key, default in {
@@ -25,20 +38,23 @@ for key, default in {
     'current_page': 1,
     'reviews': {},
     'full_analysis': {},
+    'comparison': [],
     'last_search_query': ""
 }.items():
     if key not in st.session_state:
         st.session_state[key] = default
 
 
-# Main App
+# Main App, profiled per rerun with REELFEEL_PROFILE=1 or `?profile=1`
+@profile_interaction('rerun', imdb_id=shown_imdb_id)
 def main():
     st.markdown(f'<h1 class="main-header">{emoji.emojize(":clapper_board:")} Movie Review Analysis Dashboard</h1>', unsafe_allow_html=True)
     
-    # two tabs
-    tab1, tab2 = st.tabs([
+    # three tabs
+    tab1, tab2, tab3 = st.tabs([
         f"{emoji.emojize(':house:')} How It Works", 
-        f"{emoji.emojize(':bar_chart:')} Movie Reviews Sentiment Analysis"
+        f"{emoji.emojize(':bar_chart:')} Movie Reviews Sentiment Analysis",
+        f"{emoji.emojize(':card_file_box:')} Cross-Movie Insights"
     ])
     
     with tab1:
@@ -52,6 +68,12 @@ def main():
             sentiment_analysis_tab()
         except Exception as e:
             st.error(f"An error occurred during sentiment analysis: {e}")
+
+    with tab3:
+        try:
+            warehouse_insights_tab()
+        except Exception as e:
+            st.error(f"An error occurred while loading cross-movie insights: {e}")
         
 if __name__ == "__main__":
     main()
\ No newline at end of file
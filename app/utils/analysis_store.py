@@ -0,0 +1,194 @@
+import os
+import json
+import tempfile
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from config import analysis_cache_dir, scrape_max_workers, refresh_max_pages
+from utils.review_scrapper import get_reviews, get_review_page
+from utils.predict_sentiment import predict
+from utils.review_aggregates import aggregate_reviews, merge_aggregates
+from utils.review_warehouse import record_analysis
+
+def _analysis_path(imdb_id: str) -> str:
+    return os.path.join(analysis_cache_dir, f"{imdb_id}.json")
+
+def load_analysis(imdb_id: str) -> dict:
+    """Load the stored analysis of a title, None if it was never analyzed."""
+    path = _analysis_path(imdb_id)
+    if not imdb_id or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        print(f"[Warning] Ignoring unreadable stored analysis for {imdb_id}: {e}")
+        return None
+
+# serializes read-modify-write cycles of the stored analyses between sessions
+_store_lock = threading.RLock()
+
+def save_analysis(imdb_id: str, analysis: dict) -> None:
+    """Persist the analysis of a title, written atomically so readers never see half a file."""
+    os.makedirs(analysis_cache_dir, exist_ok=True)
+    # a temp file per writer, concurrent saves must not write into one file
+    with _store_lock:
+        with tempfile.NamedTemporaryFile('w', dir=analysis_cache_dir, suffix='.tmp',
+                                         delete=False, encoding='utf-8') as file:
+            try:
+                json.dump(analysis, file)
+            except Exception:
+                file.close()
+                os.remove(file.name)
+                raise
+        os.replace(file.name, _analysis_path(imdb_id))
+
+def store_explanation(imdb_id: str, review: dict) -> None:
+    """Write the 'explanation' of one review into the stored analysis of its title."""
+    with _store_lock:
+        analysis = load_analysis(imdb_id)
+        if analysis is None:
+            return
+        for stored in analysis['reviews']:
+            if stored.get('review_id') == review.get('review_id'):
+                stored['explanation'] = review['explanation']
+                save_analysis(imdb_id, analysis)
+                return
+
+def _keep_explanations(imdb_id: str, analysis: dict) -> None:
+    """Copy explanations stored since `analysis` was loaded, so saving it does not drop them."""
+    stored = load_analysis(imdb_id)
+    if stored is None:
+        return
+    explanations = {r.get('review_id'): r['explanation'] for r in stored['reviews'] if 'explanation' in r}
+    for review in analysis['reviews']:
+        if 'explanation' not in review and review.get('review_id') in explanations:
+            review['explanation'] = explanations[review['review_id']]
+
+def _latest_date(reviews: list[dict], current: str = None) -> str:
+    dates = [r['date'] for r in reviews if r.get('date')]
+    if current:
+        dates.append(current)
+    return max(dates) if dates else None
+
+def _new_analysis(imdb_id: str, scored_reviews: list[dict]) -> dict:
+    return {
+        'imdbID': imdb_id,
+        'reviews': scored_reviews,
+        'aggregates': aggregate_reviews(scored_reviews),
+        'latest_review_date': _latest_date(scored_reviews),
+    }
+
+def _unseen_reviews(imdb_id: str, seen: set, max_pages: int = refresh_max_pages) -> list[dict]:
+    """Newest-first reviews up to the first already seen one, following as many pages as needed."""
+    unseen, pagination_key = [], None
+    for page in range(max_pages):
+        fetched, pagination_key = get_review_page(imdb_id, newest_first=True, pagination_key=pagination_key)
+        if fetched is None:
+            if page == 0:
+                raise ConnectionError("Could not fetch new reviews.")
+            print(f"[Warning] Stopped paging new reviews of {imdb_id} after {page} page(s)")
+            break
+        unseen += [r for r in fetched if r['review_id'] not in seen]
+        if any(r['review_id'] in seen for r in fetched) or not pagination_key:
+            break
+    else:
+        print(f"[Warning] More than {max_pages} pages of new reviews for {imdb_id}, older ones are left out")
+    return unseen
+
+def refresh_analysis(imdb_id: str, analysis: dict = None, movie: dict = None) -> tuple:
+    """
+    Analyze a title, scoring only reviews that are new since the last crawl.
+
+    Reviews are always crawled newest first. The first call scrapes and scores
+    the newest page. Later calls page through the newest reviews until they
+    reach one seen before, score only the unseen ones and fold them into the
+    stored aggregates.
+
+    Args:
+        imdb_id (str): IMDb ID of the movie (e.g., 'tt1234567')
+        analysis (dict): Previously stored analysis, loaded from disk if None
+        movie (dict): OMDb movie data, the result is also recorded in the review warehouse if given
+
+    Returns:
+        tuple: (analysis, number of newly scored reviews)
+    """
+    if analysis is None:
+        analysis = load_analysis(imdb_id)
+
+    if analysis is None:
+        reviews = get_reviews(imdb_id, newest_first=True)
+        if not reviews:
+            raise ValueError("No reviews to fetch!")
+        new_reviews = predict(reviews, keep_tokens=True)
+        analysis = _new_analysis(imdb_id, new_reviews)
+    else:
+        new_reviews = _unseen_reviews(imdb_id, {r.get('review_id') for r in analysis['reviews']})
+        if new_reviews:
+            new_reviews = predict(new_reviews, keep_tokens=True)
+            analysis['reviews'] = new_reviews + analysis['reviews']
+            analysis['aggregates'] = merge_aggregates(analysis['aggregates'], aggregate_reviews(new_reviews))
+            analysis['latest_review_date'] = _latest_date(new_reviews, analysis.get('latest_review_date'))
+
+    analysis['last_crawl'] = datetime.now().isoformat(timespec='seconds')
+    with _store_lock:
+        _keep_explanations(imdb_id, analysis)
+        save_analysis(imdb_id, analysis)
+    if movie:
+        record_analysis(movie, analysis)
+    return analysis, len(new_reviews)
+
+def analyze_titles(movies: list[dict]) -> dict:
+    """
+    Analyze several titles at once for side-by-side comparison.
+
+    Titles with a stored analysis are reused. The newest review pages of the
+    others are scraped concurrently and all their reviews are scored in one
+    combined `predict()` call, so comparing N titles costs about one analysis.
+
+    Args:
+        movies (list): OMDb movie data of the movies to compare
+
+    Returns:
+        dict: imdbID -> analysis, titles without any reviews are left out
+    """
+    movies_by_id = {movie['imdbID']: movie for movie in movies}
+    analyses = {}
+    missing = []
+    for imdb_id in movies_by_id:
+        stored = load_analysis(imdb_id)
+        if stored:
+            analyses[imdb_id] = stored
+        else:
+            missing.append(imdb_id)
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(len(missing), scrape_max_workers)) as executor:
+            fetched = dict(zip(missing, executor.map(lambda imdb_id: get_reviews(imdb_id, newest_first=True), missing)))
+
+        # one batch for every title, each review remembers which title it came from
+        combined, owners = [], []
+        for imdb_id, reviews in fetched.items():
+            if not reviews:
+                print(f"[Warning] No reviews to compare for {imdb_id}")
+                continue
+            combined.extend(reviews)
+            owners.extend([imdb_id] * len(reviews))
+
+        if combined:
+            predict(combined, keep_tokens=True)
+
+        scored = {}
+        for imdb_id, review in zip(owners, combined):
+            scored.setdefault(imdb_id, []).append(review)
+
+        now = datetime.now().isoformat(timespec='seconds')
+        for imdb_id, reviews in scored.items():
+            analysis = _new_analysis(imdb_id, reviews)
+            analysis['last_crawl'] = now
+            save_analysis(imdb_id, analysis)
+            record_analysis(movies_by_id[imdb_id], analysis)
+            analyses[imdb_id] = analysis
+
+    return analyses
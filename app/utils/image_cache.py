@@ -0,0 +1,97 @@
+import os
+import time
+import hashlib
+import tempfile
+import requests
+from io import BytesIO
+from PIL import Image
+
+from config import image_cache_dir, image_cache_max_bytes, thumbnail_width, request_headers
+from config import image_failure_ttl_seconds
+
+# url -> time of the last failed download, so dead poster URLs are not fetched on every rerun
+_failed = {}
+
+def _thumbnail_path(url: str) -> str:
+    return os.path.join(image_cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.jpg')
+
+def _evict(max_bytes: int = image_cache_max_bytes) -> None:
+    """Delete least recently used thumbnails until the cache fits in `max_bytes`."""
+    entries = []
+    for name in os.listdir(image_cache_dir):
+        if name.endswith('.tmp'):
+            continue  # still being written
+        path = os.path.join(image_cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue  # removed by a concurrent eviction
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+def cached_thumbnail(url: str) -> str:
+    """
+    Return the local path of a resized thumbnail for a remote image.
+
+    The image is downloaded and resized only the first time. Later calls just
+    mark the file as recently used, which is what eviction is based on. A URL
+    that failed is not retried for `image_failure_ttl_seconds`.
+
+    Args:
+        url (str): Remote poster or cover image URL.
+
+    Returns:
+        str: Path of the cached JPEG thumbnail, None if it could not be fetched.
+    """
+    if not url or url == 'N/A':
+        return None
+
+    path = _thumbnail_path(url)
+    try:
+        os.utime(path)  # mark as recently used
+        return path
+    except OSError:
+        pass  # not cached yet, or just evicted by another session
+
+    failed_at = _failed.get(url)
+    if failed_at is not None and time.monotonic() - failed_at < image_failure_ttl_seconds:
+        return None
+
+    try:
+        response = requests.get(url, headers=request_headers, timeout=10)
+        response.raise_for_status()
+
+        image = Image.open(BytesIO(response.content)).convert('RGB')
+        if image.width > thumbnail_width:
+            height = round(image.height * thumbnail_width / image.width)
+            image = image.resize((thumbnail_width, height), Image.LANCZOS)
+
+        os.makedirs(image_cache_dir, exist_ok=True)
+        # a temp file per writer, sessions fetching the same poster must not write into one file
+        with tempfile.NamedTemporaryFile(dir=image_cache_dir, suffix='.tmp', delete=False) as file:
+            tmp_path = file.name
+            try:
+                image.save(file, format='JPEG', quality=85, optimize=True)
+            except Exception:
+                file.close()
+                os.remove(tmp_path)
+                raise
+        os.replace(tmp_path, path)
+
+        _failed.pop(url, None)
+        _evict()
+        return path if os.path.exists(path) else None
+
+    except Exception as e:
+        _failed[url] = time.monotonic()
+        print(f"[Warning] Could not cache image {url}: {e}")
+        return None
@@ -0,0 +1,153 @@
+import numpy as np
+
+# Multiplicative hashing constants (odd 64-bit values) used to spread token ids
+# and token-id pairs over the 2**n_bits weight buckets.
+_UNIGRAM_KEY = np.uint64(0x9E3779B97F4A7C15)
+_BIGRAM_KEY = np.uint64(0xC2B2AE3D27D4EB4F)
+_PAIR_KEY = np.uint64(0x165667B19E3779F9)
+
+# num_words of the training data (ids at or above it were <UNK>), for models saved without it
+DEFAULT_VOCABULARY_SIZE = 20000
+
+def _bucket(hashed: np.ndarray, n_bits: int) -> np.ndarray:
+    """Keep the top `n_bits` bits of a 64-bit hash as the bucket index."""
+    return (hashed >> np.uint64(64 - n_bits)).astype(np.int64)
+
+def ngram_features(encoded_reviews: list[list[int]], n_bits: int, ngram: int = 2):
+    """
+    Hash the unigrams (and bigrams) of a batch of encoded reviews.
+
+    All reviews are flattened into one array so the whole batch is hashed with
+    a handful of vectorized NumPy operations.
+
+    Args:
+        encoded_reviews (list): Token id sequences as produced by `encode_review`.
+        n_bits (int): Number of hash bits, the model has 2**n_bits weights.
+        ngram (int): 1 for unigrams only, 2 to add bigrams.
+
+    Returns:
+        tuple: (rows, buckets, counts) where `rows[k]` is the review that the
+        k-th hashed feature belongs to, `buckets[k]` its weight index and
+        `counts[i]` the number of features of review i.
+    """
+    n_reviews = len(encoded_reviews)
+    lengths = np.fromiter((len(e) for e in encoded_reviews), dtype=np.int64, count=n_reviews)
+    if lengths.sum() == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(n_reviews, dtype=np.int64)
+
+    flat = np.concatenate([np.asarray(e, dtype=np.uint64) for e in encoded_reviews if len(e)])
+    rows = np.repeat(np.arange(n_reviews), lengths)
+    buckets = _bucket(flat * _UNIGRAM_KEY, n_bits)
+
+    if ngram >= 2 and len(flat) > 1:
+        # pairs that straddle two reviews are dropped
+        same_review = rows[1:] == rows[:-1]
+        pairs = (flat[:-1] * _PAIR_KEY + flat[1:]) * _BIGRAM_KEY
+        rows = np.concatenate([rows, rows[1:][same_review]])
+        buckets = np.concatenate([buckets, _bucket(pairs[same_review], n_bits)])
+
+    counts = np.bincount(rows, minlength=n_reviews)
+    return rows, buckets, counts
+
+def _logits(rows, buckets, counts, weights, bias):
+    # every feature has value 1/sqrt(count) so long and short reviews are on the same scale
+    n_reviews = len(counts)
+    totals = np.bincount(rows, weights=weights[buckets], minlength=n_reviews)
+    return bias + totals / np.sqrt(np.maximum(counts, 1))
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+def linear_scores(encoded_reviews: list[list[int]], linear_model: dict) -> np.ndarray:
+    """
+    Score a batch of encoded reviews with a hashed n-gram logistic regression.
+
+    Args:
+        encoded_reviews (list): Token id sequences as produced by `encode_review`.
+        linear_model (dict): Model as returned by `load_linear_model`.
+
+    Returns:
+        np.ndarray: Positive-sentiment probability for every review.
+    """
+    rows, buckets, counts = ngram_features(
+        encoded_reviews, linear_model['n_bits'], linear_model['ngram']
+    )
+    logits = _logits(rows, buckets, counts, linear_model['weights'], linear_model['bias'])
+    return _sigmoid(logits)
+
+def train_linear_model(encoded_reviews: list[list[int]], labels, n_bits: int = 20, ngram: int = 2,
+                       epochs: int = 5, batch_size: int = 256, learning_rate: float = 0.1,
+                       l2: float = 1e-6, seed: int = 42, vocabulary_size: int = DEFAULT_VOCABULARY_SIZE) -> dict:
+    """
+    Train the hashed n-gram logistic regression with mini-batch Adagrad.
+
+    Args:
+        encoded_reviews (list): Token id sequences.
+        labels (array-like): 0/1 sentiment labels.
+        n_bits (int): Number of hash bits.
+        ngram (int): 1 for unigrams only, 2 to add bigrams.
+        epochs (int): Passes over the training data.
+        batch_size (int): Reviews per gradient step.
+        learning_rate (float): Adagrad step size.
+        l2 (float): L2 penalty on the weights.
+        seed (int): Shuffling seed.
+        vocabulary_size (int): Ids at or above this value were mapped to <UNK> in the training
+            data, inference must do the same before scoring.
+
+    Returns:
+        dict: Model in the same layout as `load_linear_model`.
+    """
+    labels = np.asarray(labels, dtype=np.float64)
+    n_reviews = len(encoded_reviews)
+    if n_reviews != len(labels):
+        raise ValueError("encoded_reviews and labels must have the same length.")
+
+    weights = np.zeros(2 ** n_bits, dtype=np.float64)
+    grad_sq = np.full(2 ** n_bits, 1e-8)
+    bias, bias_grad_sq = 0.0, 1e-8
+    rng = np.random.default_rng(seed)
+
+    for _ in range(epochs):
+        order = rng.permutation(n_reviews)
+        for start in range(0, n_reviews, batch_size):
+            idx = order[start:start + batch_size]
+            rows, buckets, counts = ngram_features([encoded_reviews[i] for i in idx], n_bits, ngram)
+            scale = 1.0 / np.sqrt(np.maximum(counts, 1))
+            error = _sigmoid(_logits(rows, buckets, counts, weights, bias)) - labels[idx]
+
+            # sparse gradient: only the buckets seen in this batch are updated
+            grad = np.bincount(buckets, weights=(error * scale)[rows], minlength=len(weights)) / len(idx)
+            touched = np.unique(buckets)
+            grad_t = grad[touched] + l2 * weights[touched]
+            grad_sq[touched] += grad_t ** 2
+            weights[touched] -= learning_rate * grad_t / np.sqrt(grad_sq[touched])
+
+            bias_grad = error.mean()
+            bias_grad_sq += bias_grad ** 2
+            bias -= learning_rate * bias_grad / np.sqrt(bias_grad_sq)
+
+    return {'weights': weights.astype(np.float32), 'bias': float(bias), 'n_bits': n_bits, 'ngram': ngram,
+            'vocabulary_size': vocabulary_size}
+
+def save_linear_model(path: str, linear_model: dict) -> None:
+    """Write a linear model to a compressed `.npz` file."""
+    np.savez_compressed(
+        path,
+        weights=linear_model['weights'],
+        bias=np.float64(linear_model['bias']),
+        n_bits=np.int64(linear_model['n_bits']),
+        ngram=np.int64(linear_model['ngram']),
+        vocabulary_size=np.int64(linear_model.get('vocabulary_size', DEFAULT_VOCABULARY_SIZE)),
+    )
+
+def load_linear_model(path: str) -> dict:
+    """Read a linear model written by `save_linear_model`."""
+    with np.load(path) as data:
+        return {
+            'weights': data['weights'].astype(np.float64),
+            'bias': float(data['bias']),
+            'n_bits': int(data['n_bits']),
+            'ngram': int(data['ngram']),
+            'vocabulary_size': int(data['vocabulary_size']) if 'vocabulary_size' in data else DEFAULT_VOCABULARY_SIZE,
+        }
@@ -1,10 +1,16 @@
 import os
+import json
+import time
 import requests
-from imdb import Cinemagoer
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from pathlib import Path
 import streamlit as st
 
+from config import movie_search_backend, omdb_url, omdb_cache_dir, omdb_cache_ttl_hours, omdb_failure_ttl_seconds
+from config import search_max_results, scrape_max_workers, title_index_enabled
+from utils.title_index import title_index_available, search_titles
+
 # for deployement
 try:
     # Try to load from Streamlit secrets (used in deployed app)
@@ -15,10 +21,107 @@ except Exception:
     load_dotenv(dotenv_path=env_path)
     API_KEY = os.getenv("API_KEY")
 
+# imdbID -> time of the last failed details lookup, so `with_details` does not retry it on every rerun
+_details_failed = {}
+
+def _omdb_get(params: dict) -> dict:
+    # requests URL-encodes the params, titles with '&', '#' or accents are sent intact
+    response = requests.get(omdb_url, params={**params, 'apikey': API_KEY}, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+def _details_path(imdb_id: str) -> str:
+    return os.path.join(omdb_cache_dir, f"{imdb_id}.json")
+
+def load_cached_details(imdb_id: str, max_age_hours: float = omdb_cache_ttl_hours) -> dict:
+    """OMDb details of a title from the local cache, None if missing or older than `max_age_hours`."""
+    path = _details_path(imdb_id)
+    if not os.path.exists(path) or time.time() - os.path.getmtime(path) > max_age_hours * 3600:
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        print(f"[Warning] Ignoring unreadable cached details for {imdb_id}: {e}")
+        return None
+
+def _save_details(imdb_id: str, data: dict) -> None:
+    os.makedirs(omdb_cache_dir, exist_ok=True)
+    path = _details_path(imdb_id)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+    os.replace(tmp_path, path)
+
+def fetch_movie_details(imdb_id: str, refresh: bool = False) -> dict:
+    """
+    OMDb details of one title looked up by imdbID, served from the local cache when fresh.
+
+    Args:
+        imdb_id (str): IMDb ID of the title (e.g., 'tt1375666').
+        refresh (bool): Skip the cache and fetch from OMDb.
+
+    Returns:
+        dict: OMDb details, None if OMDb does not know the title.
+    """
+    if not refresh:
+        cached = load_cached_details(imdb_id)
+        if cached:
+            return cached
+
+    data = _omdb_get({'i': imdb_id})
+    if data.get('Response') == 'False':
+        print(f"OMDb Error for '{imdb_id}': {data.get('Error')}")
+        return None
 
+    _save_details(imdb_id, data)
+    return data
+
+def _search_omdb(movie_name: str, max_results: int) -> list[dict]:
+    """One OMDb search request, returns [{'imdbID': ...}, ...] (at most 10 per page)."""
+    data = _omdb_get({'s': movie_name})
+    if data.get('Response') == 'False':
+        return []
+    return [{'imdbID': item['imdbID']} for item in data.get('Search', [])[:max_results]]
+
+def _search_cinemagoer(movie_name: str, max_results: int) -> list[dict]:
+    """IMDb search through Cinemagoer, keeps the full-size cover if IMDb has one."""
+    from imdb import Cinemagoer
+
+    results = []
+    for movie in Cinemagoer().search_movie(movie_name)[:max_results]:
+        result = {'imdbID': f"tt{movie.movieID}"}
+        if 'full-size cover url' in movie:
+            result['Cover Image'] = movie['full-size cover url']
+        results.append(result)
+    return results
+
+def search_movie_ids(movie_name: str, backend: str = movie_search_backend,
+                     max_results: int = search_max_results) -> list[dict]:
+    """
+    Search titles by name, returns their imdbIDs in relevance order.
+
+    Args:
+        movie_name (str): Name of the movie to search.
+        backend (str): 'omdb' (a single request) or 'cinemagoer', which falls
+            back to OMDb if the package is not installed.
+        max_results (int): Maximum number of results.
+
+    Returns:
+        list[dict]: {'imdbID': ...} per result, optionally with a 'Cover Image'.
+    """
+    if backend == 'cinemagoer':
+        try:
+            return _search_cinemagoer(movie_name, max_results)
+        except ImportError:
+            print("[Warning] Cinemagoer is not installed, searching with OMDb instead.")
+    return _search_omdb(movie_name, max_results)
 
 def fetch_movie_data(movie_name: str) -> list[dict]:
-    """Fetch movie details using IMDbPy and OMDb API.
+    """Search movies by name and fetch their OMDb details by imdbID.
+
+    Details are looked up concurrently and cached per imdbID, so a repeated
+    search only costs the search request.
 
     Args:
         movie_name (str): Name of the movie to search.
@@ -26,52 +129,80 @@ def fetch_movie_data(movie_name: str) -> list[dict]:
     Returns:
         list[dict]: List of dictionaries containing movie data.
     """
-    data_list = []
     try:
         if not API_KEY:
             raise EnvironmentError("API_KEY not found in environment.")
 
-        imdb_obj = Cinemagoer()
-        search_results = imdb_obj.search_movie(movie_name)
-
+        search_results = search_movie_ids(movie_name)
         if not search_results:
-            raise ValueError("No movie found with the given name.")
-
-        total_results = len(search_results)
-        for i in range(min(total_results, 10)):
-            movie = search_results[i]
-            movie_title = movie.get('title', '')
-            if not movie_title:
-                continue
-
-            url = f"http://www.omdbapi.com/?t={movie_title}&apikey={API_KEY}"
-            try:
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+            return []
 
-                if data.get('Response') == 'False':
-                    print(f"OMDb Error for '{movie_title}': {data.get('Error')}")
-                    continue
+        with ThreadPoolExecutor(max_workers=min(scrape_max_workers, len(search_results))) as pool:
+            details = list(pool.map(lambda result: fetch_movie_details(result['imdbID']), search_results))
 
-                if 'full-size cover url' in movie:
-                    data['Cover Image'] = movie['full-size cover url']
-
-                data_list.append(data)
-
-            except requests.exceptions.RequestException as re:
-                print(f"Network error for movie '{movie_title}': {re}")
-                return None
-            except ValueError as ve:
-                print(f"OMDb response parsing error: {ve}")
-                return None
+        data_list = []
+        for result, data in zip(search_results, details):
+            if not data:
+                continue
+            if 'Cover Image' in result:
+                data = {**data, 'Cover Image': result['Cover Image']}
+            data_list.append(data)
 
+    except requests.exceptions.RequestException as re:
+        print(f"Network error while searching '{movie_name}': {re}")
+        return None
+    except ValueError as ve:
+        print(f"OMDb response parsing error: {ve}")
+        return None
     except Exception as e:
         print(f"Fatal error fetching movie data: {e}")
         return None
 
     return data_list
 
+def with_details(movie: dict) -> dict:
+    """
+    Add the OMDb details to a search result from the title index, full results are returned as is.
+
+    A title whose lookup failed or that OMDb does not know is returned without
+    details and not looked up again for `omdb_failure_ttl_seconds`.
+    """
+    imdb_id = movie.get('imdbID')
+    if movie.get('Response') == 'True' or not imdb_id:
+        return movie
+    failed_at = _details_failed.get(imdb_id)
+    if failed_at is not None and time.monotonic() - failed_at < omdb_failure_ttl_seconds:
+        return movie
+    try:
+        details = fetch_movie_details(imdb_id)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"[Warning] Could not fetch details for {imdb_id}: {e}")
+        details = None
+    if not details:
+        _details_failed[imdb_id] = time.monotonic()
+        return movie
+    _details_failed.pop(imdb_id, None)
+    return {**movie, **details}
+
+def search_movies(movie_name: str) -> list[dict]:
+    """Search the offline title index when it is built, OMDb otherwise.
+
+    Title index results only hold imdbID, title, year, type and votes; their
+    details are fetched with `with_details` once a result is shown.
+
+    Args:
+        movie_name (str): Name of the movie to search.
+
+    Returns:
+        list[dict]: Best matches first, None on network errors.
+    """
+    if title_index_enabled and title_index_available():
+        try:
+            return search_titles(movie_name, k=search_max_results)
+        except (OSError, ValueError) as e:
+            print(f"[Warning] Title index unusable, searching OMDb instead: {e}")
+    return fetch_movie_data(movie_name)
+
 # for testing
 # for movie in fetch_movie_data('Inception'):
-#     print("\n\n New Movie:\n", movie) 
\ No newline at end of file
+#     print("\n\n New Movie:\n", movie)
@@ -1,11 +1,25 @@
 import os
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
 import numpy as np
 import tensorflow as tf
+from tensorflow.keras import Input, Model
+from tensorflow.keras.layers import Embedding, SimpleRNN, Dense
 from tensorflow.keras.models import load_model
 from tensorflow.keras.preprocessing.sequence import pad_sequences
 
+from config import fast_model_path, cascade_enabled, cascade_band, explain_token_budget
+from config import predict_memory_budget_mb, sentiment_models, sentiment_model
+from config import long_review_chunking, long_review_chunk_len
+from config import inference_batching, inference_batch_window_ms, inference_max_batch_reviews
+from utils.linear_sentiment import load_linear_model, linear_scores
+
 MAX_LEN = 1000
-MODEL_PATH = "./models/imdb_rnn_model_02_split_80_20.keras"
+MODEL_PATH = sentiment_models[sentiment_model]
+OOV_ID = 2
 
 # Loading IMDB word index 
 try:
@@ -22,10 +36,62 @@ except Exception as e:
 try:
     if not os.path.exists(MODEL_PATH):
         raise FileNotFoundError(f"Model file not found at path: {MODEL_PATH}")
-    model = load_model(MODEL_PATH)
+    model = load_model(MODEL_PATH, compile=False)  # inference only
 except Exception as e:
     raise RuntimeError(f"Failed to load sentiment analysis model: {e}")
 
+# other registered models are loaded on first use, see `get_model`
+_models = {sentiment_model: model}
+
+# Optional first stage of the cascade, the app falls back to RNN-only without it
+fast_model = None
+if os.path.exists(fast_model_path):
+    try:
+        fast_model = load_linear_model(fast_model_path)
+    except Exception as e:
+        print(f"[Warning] Could not load fast sentiment model, cascade disabled: {e}")
+
+# TensorFlow holds about three copies of each activation during a forward pass
+# (layer output, the SimpleRNN's time-major transpose and temporaries), measured
+# with `python -m scripts.predict_memory_report`
+ACTIVATION_OVERHEAD = 3
+
+def _row_bytes(keras_model) -> int:
+    """Approximate bytes one review needs in a forward pass: padded ids plus every layer's output."""
+    total = MAX_LEN * 4
+    shape = (None, MAX_LEN)
+    for layer in keras_model.layers:
+        shape = layer.compute_output_shape(shape)
+        total += int(np.prod(shape[1:])) * 4 * ACTIVATION_OVERHEAD
+    return total
+
+ROW_BYTES = _row_bytes(model)
+_row_bytes_by_model = {sentiment_model: ROW_BYTES}
+
+def get_model(model_name: str = sentiment_model):
+    """
+    Registered sentiment model by name, loaded once and kept for later calls.
+
+    Args:
+        model_name (str): Key of `sentiment_models` in the config.
+
+    Returns:
+        keras.Model: Model mapping pre-padded token ids to a positive-sentiment probability.
+    """
+    if model_name not in _models:
+        if model_name not in sentiment_models:
+            raise KeyError(f"Unknown sentiment model '{model_name}', expected one of {list(sentiment_models)}")
+        path = sentiment_models[model_name]
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model file not found at path: {path}")
+        _models[model_name] = load_model(path, compile=False)
+        _row_bytes_by_model[model_name] = _row_bytes(_models[model_name])
+    return _models[model_name]
+
+# Upper bounds of NEGATIVE and NEUTRAL scores, see `sentiment`
+SENTIMENT_THRESHOLDS = np.array([0.4, 0.6])
+SENTIMENT_LABELS = np.array(["NEGATIVE", "NEUTRAL", "POSITIVE"])
+
 def sentiment(score: float) -> str:
     if score <= 0.4:
         return "NEGATIVE"
@@ -34,6 +100,10 @@ def sentiment(score: float) -> str:
     else:
         return "POSITIVE"
 
+def sentiment_labels(scores: np.ndarray) -> np.ndarray:
+    """Vectorized `sentiment`: one threshold lookup for the whole score array."""
+    return SENTIMENT_LABELS[np.searchsorted(SENTIMENT_THRESHOLDS, scores, side='left')]
+
 def encode_review(text: str) -> list[int]:
     """
     Convert text to integer sequence based on IMDB word_index
@@ -48,12 +118,301 @@ def encode_review(text: str) -> list[int]:
         encoded.append(index)
     return encoded
 
-def predict(reviews: list[dict]) -> list[dict]:
+# Embedding -> SimpleRNN -> Dense models rebuilt to run one chunk at a time, see `_chunk_step`
+_chunk_steps = {}
+
+def _chunk_step(model_name: str, chunk_len: int = long_review_chunk_len) -> tuple:
+    """
+    Chunk-at-a-time version of a registered model, built once per model.
+
+    The step model shares the model's layers, takes a chunk of token ids and the
+    SimpleRNN state after the previous chunk, and returns the new state and the
+    score the model would give if the review ended here.
+
+    Returns:
+        tuple: (step_model, bytes one review needs per step), None if the model is
+        not Embedding -> SimpleRNN -> Dense.
+    """
+    if model_name not in _chunk_steps:
+        layers = get_model(model_name).layers
+        kinds = (Embedding, SimpleRNN, Dense)
+        if len(layers) != 3 or not all(isinstance(layer, kind) for layer, kind in zip(layers, kinds)):
+            _chunk_steps[model_name] = None
+        else:
+            embedding, rnn, head = layers
+            step_rnn = SimpleRNN.from_config({**rnn.get_config(), 'name': f"{rnn.name}_step",
+                                              'return_sequences': False, 'return_state': True})
+            tokens = Input((None,), dtype='int32')
+            state = Input((rnn.units,))
+            _, new_state = step_rnn(embedding(tokens), initial_state=state)
+            step_rnn.set_weights(rnn.get_weights())
+            step_model = Model([tokens, state], [new_state, head(new_state)])
+            # ids and embedded chunk, the state is carried over and does not grow with the review
+            row_bytes = chunk_len * 4 + (chunk_len * embedding.output_dim + 2 * rnn.units) * 4 * ACTIVATION_OVERHEAD
+            _chunk_steps[model_name] = (step_model, row_bytes)
+    return _chunk_steps[model_name]
+
+def chunked_rnn_scores(encoded_reviews: list[list[int]], memory_budget_mb: float = predict_memory_budget_mb,
+                       model_name: str = sentiment_model, chunk_len: int = long_review_chunk_len) -> np.ndarray:
+    """
+    Score reviews of any length by running the SimpleRNN over `chunk_len`-token chunks.
+
+    Each review is pre-padded to a whole number of chunks and its RNN state is
+    carried from chunk to chunk, so the full text is scored while one model call
+    only holds `chunk_len` steps per review. Reviews with the same chunk count
+    are scored together, as many as fit in `memory_budget_mb`.
+
+    Args:
+        encoded_reviews (list): Token id sequences as produced by `encode_review`.
+        memory_budget_mb (float): Memory budget of a single model call.
+        model_name (str): Key of `sentiment_models` in the config, must be Embedding -> SimpleRNN -> Dense.
+        chunk_len (int): Tokens per chunk.
+
+    Returns:
+        np.ndarray: Positive-sentiment probability for every review.
+    """
+    step = _chunk_step(model_name, chunk_len)
+    if step is None:
+        raise ValueError(f"Model '{model_name}' has no single SimpleRNN to score in chunks")
+    step_model, row_bytes = step
+    vocabulary_size = get_model(model_name).layers[0].input_dim
+    units = step_model.output_shape[0][-1]
+    batch_size = max(1, int(memory_budget_mb * 1024 * 1024 // row_bytes))
+
+    by_chunks = {}
+    for i, review in enumerate(encoded_reviews):
+        by_chunks.setdefault(max(1, math.ceil(len(review) / chunk_len)), []).append(i)
+
+    scores = np.zeros(len(encoded_reviews), dtype=np.float32)
+    for n_chunks, indices in by_chunks.items():
+        for start in range(0, len(indices), batch_size):
+            batch = indices[start:start + batch_size]
+            lead = [n_chunks * chunk_len - len(encoded_reviews[i]) for i in batch]  # pre-padding
+            state = np.zeros((len(batch), units), dtype=np.float32)
+            for offset in range(0, n_chunks * chunk_len, chunk_len):
+                # only this chunk's ids are materialized, right-aligned so padding comes first
+                chunk = np.zeros((len(batch), chunk_len), dtype=np.int32)
+                for row, (i, pad) in enumerate(zip(batch, lead)):
+                    tokens = encoded_reviews[i][max(offset - pad, 0):offset - pad + chunk_len]
+                    if tokens:
+                        chunk[row, chunk_len - len(tokens):] = tokens
+                chunk[chunk >= vocabulary_size] = OOV_ID
+                state, batch_scores = step_model.predict_on_batch([chunk, state])
+                state = np.asarray(state)
+            scores[batch] = np.asarray(batch_scores).reshape(-1)
+
+    return scores
+
+def rnn_scores(encoded_reviews: list[list[int]], memory_budget_mb: float = predict_memory_budget_mb,
+               model_name: str = sentiment_model) -> np.ndarray:
+    """
+    Score encoded reviews with a registered neural model, the RNN by default.
+
+    Reviews are padded and run through the model in chunks small enough that
+    one chunk's padded ids and layer activations fit in `memory_budget_mb`,
+    so peak memory does not grow with the number of reviews. Ids outside the
+    model's vocabulary are scored as <UNK>. Reviews longer than `MAX_LEN` are
+    scored on their full text with `chunked_rnn_scores` if `long_review_chunking`
+    is on and the model supports it, otherwise only their last `MAX_LEN` tokens count.
+
+    Args:
+        encoded_reviews (list): Token id sequences as produced by `encode_review`.
+        memory_budget_mb (float): Memory budget of a single model call.
+        model_name (str): Key of `sentiment_models` in the config.
+
+    Returns:
+        np.ndarray: Positive-sentiment probability for every review.
+    """
+    scoring_model = get_model(model_name)
+    vocabulary_size = getattr(scoring_model.layers[0], 'input_dim', None)  # Embedding first
+    scores = np.zeros(len(encoded_reviews), dtype=np.float32)
+    chunk_size = max(1, int(memory_budget_mb * 1024 * 1024 // _row_bytes_by_model[model_name]))
+
+    indices = np.arange(len(encoded_reviews))
+    if long_review_chunking and _chunk_step(model_name) is not None:
+        is_long = np.array([len(review) > MAX_LEN for review in encoded_reviews], dtype=bool)
+        if is_long.any():
+            long_indices = indices[is_long]
+            scores[long_indices] = chunked_rnn_scores([encoded_reviews[i] for i in long_indices],
+                                                      memory_budget_mb, model_name)
+            indices = indices[~is_long]
+
+    for start in range(0, len(indices), chunk_size):
+        chunk = indices[start:start + chunk_size]
+        padded_reviews = pad_sequences([encoded_reviews[i] for i in chunk], maxlen=MAX_LEN, padding='pre')
+        if vocabulary_size:
+            padded_reviews[padded_reviews >= vocabulary_size] = OOV_ID
+        scores[chunk] = np.asarray(scoring_model.predict_on_batch(padded_reviews)).reshape(-1)
+
+    return scores
+
+def _fast_scores(encoded_reviews: list[list[int]]) -> np.ndarray:
+    """Scores of the linear first stage of the cascade."""
+    # ids the linear model was trained on as <UNK> would otherwise hash into buckets it never learned
+    vocabulary_size = fast_model['vocabulary_size']
+    clipped = [np.where(np.asarray(review) < vocabulary_size, review, OOV_ID) for review in encoded_reviews]
+    return linear_scores(clipped, fast_model).astype(np.float32)
+
+def cascade_scores(encoded_reviews: list[list[int]], band: tuple = cascade_band,
+                   memory_budget_mb: float = predict_memory_budget_mb,
+                   model_name: str = sentiment_model) -> tuple:
+    """
+    Score encoded reviews with the linear model, re-scoring only uncertain ones with the RNN.
+
+    Args:
+        encoded_reviews (list): Token id sequences as produced by `encode_review`.
+        band (tuple): (low, high) linear-model scores strictly inside this band go to the RNN.
+        memory_budget_mb (float): Memory budget of a single RNN call.
+        model_name (str): Registered model of the second stage.
+
+    Returns:
+        tuple: (scores, rnn_mask) where `rnn_mask` marks the reviews scored by the RNN.
+    """
+    if fast_model is None:
+        raise RuntimeError(f"Fast sentiment model not found at path: {fast_model_path}")
+
+    low, high = band
+    scores = _fast_scores(encoded_reviews)
+    rnn_mask = (scores > low) & (scores < high)
+
+    uncertain = np.flatnonzero(rnn_mask)
+    if len(uncertain):
+        scores[uncertain] = rnn_scores([encoded_reviews[i] for i in uncertain], memory_budget_mb, model_name)
+
+    return scores, rnn_mask
+
+def score_encoded(encoded_reviews: list[list[int]], cascade: bool = cascade_enabled,
+                  memory_budget_mb: float = predict_memory_budget_mb,
+                  model_name: str = sentiment_model) -> np.ndarray:
+    """Scores of encoded reviews, through the cascade if enabled and available."""
+    if cascade and fast_model is not None:
+        scores, _ = cascade_scores(encoded_reviews, memory_budget_mb=memory_budget_mb, model_name=model_name)
+        return scores
+    return rnn_scores(encoded_reviews, memory_budget_mb=memory_budget_mb, model_name=model_name)
+
+# Pending (encoded_reviews, options, future) requests of all sessions, drained by one worker thread
+_pending = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+def _start_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_inference_loop, name="inference-worker", daemon=True)
+            _worker.start()
+
+def _collect_batch() -> list:
+    """Block for one request, then take whatever else arrives within the batch window."""
+    batch = [_pending.get()]
+    rows = len(batch[0][0])
+    deadline = time.monotonic() + inference_batch_window_ms / 1000
+    while rows < inference_max_batch_reviews:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            request = _pending.get(timeout=remaining)
+        except queue.Empty:
+            break
+        batch.append(request)
+        rows += len(request[0])
+    return batch
+
+def _inference_loop():
+    while True:
+        # requests with the same options are scored as one merged batch, each caller gets its slice
+        groups = {}
+        for encoded_reviews, options, future in _collect_batch():
+            if future.set_running_or_notify_cancel():
+                groups.setdefault(options, []).append((encoded_reviews, future))
+
+        for options, requests in groups.items():
+            merged = [review for encoded_reviews, _ in requests for review in encoded_reviews]
+            try:
+                scores = score_encoded(merged, *options)
+            except Exception as e:
+                for _, future in requests:
+                    future.set_exception(e)
+                continue
+
+            start = 0
+            for encoded_reviews, future in requests:
+                future.set_result(scores[start:start + len(encoded_reviews)])
+                start += len(encoded_reviews)
+
+def submit_encoded(encoded_reviews: list[list[int]], cascade: bool = cascade_enabled,
+                   memory_budget_mb: float = predict_memory_budget_mb,
+                   model_name: str = sentiment_model) -> Future:
+    """
+    Queue encoded reviews for the shared inference worker.
+
+    The worker waits up to `inference_batch_window_ms` for requests from other
+    sessions and scores all requests with the same options in one batch.
+
+    Args:
+        encoded_reviews (list): Token id sequences as produced by `encode_review`.
+        cascade (bool): Use the linear -> RNN cascade if available.
+        memory_budget_mb (float): Memory budget of a single model call.
+        model_name (str): Key of `sentiment_models` in the config.
+
+    Returns:
+        Future: Resolves to the scores of `encoded_reviews`, in order.
+    """
+    future = Future()
+    if not encoded_reviews:
+        future.set_result(np.zeros(0, dtype=np.float32))
+        return future
+
+    _start_worker()
+    _pending.put((encoded_reviews, (cascade, memory_budget_mb, model_name), future))
+    return future
+
+def batched_scores(encoded_reviews: list[list[int]], cascade: bool = cascade_enabled,
+                   memory_budget_mb: float = predict_memory_budget_mb,
+                   model_name: str = sentiment_model) -> np.ndarray:
+    """`score_encoded` through the inference worker, or directly if batching is disabled."""
+    if not inference_batching or threading.current_thread() is _worker:
+        return score_encoded(encoded_reviews, cascade, memory_budget_mb, model_name)
+    return submit_encoded(encoded_reviews, cascade, memory_budget_mb, model_name).result()
+
+def predict_arrays(texts: list[str], cascade: bool = cascade_enabled,
+                   memory_budget_mb: float = predict_memory_budget_mb,
+                   model_name: str = sentiment_model) -> tuple:
+    """
+    Array-in/array-out variant of `predict` for plain review texts.
+
+    Args:
+        texts (list): Review texts.
+        cascade (bool): Use the linear -> RNN cascade if available.
+        memory_budget_mb (float): Memory budget of a single model call.
+        model_name (str): Key of `sentiment_models` in the config.
+
+    Returns:
+        tuple: (scores, labels) as a float array rounded to 4 decimals and a string array.
+    """
+    encoded_reviews = [encode_review(text) for text in texts]
+    scores = batched_scores(encoded_reviews, cascade, memory_budget_mb, model_name)
+    scores = np.round(scores.astype(np.float64), 4)
+    return scores, sentiment_labels(scores)
+
+def predict(reviews: list[dict], cascade: bool = cascade_enabled, keep_tokens: bool = False,
+            memory_budget_mb: float = predict_memory_budget_mb, model_name: str = sentiment_model) -> list[dict]:
     """
     Predict sentiment for list of review dictionaries.
 
+    Scoring goes through the shared inference worker, so concurrent calls from
+    several sessions are merged into one model batch (see `submit_encoded`).
+
     Args:
         reviews (list): Each dict must contain 'title' and 'content' keys.
+        cascade (bool): Score with the fast linear model first and only run the
+            RNN on reviews inside `cascade_band`. Ignored if no fast model is available.
+        keep_tokens (bool): Also store the encoded token ids under 'token_ids',
+            so term statistics can reuse them instead of re-tokenizing.
+        memory_budget_mb (float): Memory budget of a single model call, larger
+            batches are scored in chunks.
+        model_name (str): Registered model to score with, see `sentiment_models` in the config.
 
     Returns:
         list: Reviews with added 'score' and 'sentiment' keys.
@@ -73,19 +432,71 @@ def predict(reviews: list[dict]) -> list[dict]:
             encoded = encode_review(text)
             encoded_reviews.append(encoded)
 
-        padded_reviews = pad_sequences(encoded_reviews, maxlen=MAX_LEN, padding='pre')
-
-        predictions = model.predict(padded_reviews)
+        scores = batched_scores(encoded_reviews, cascade, memory_budget_mb, model_name)
+        scores = np.round(scores.astype(np.float64), 4)  # float64 so the stored values print as rounded
+        labels = sentiment_labels(scores)
 
-        for i, p in enumerate(predictions.flatten()):
-            score = np.round(p, 4)
-            reviews[i]['score'] = float(score)
-            reviews[i]['sentiment'] = sentiment(score)
+        for i, (score, label) in enumerate(zip(scores.tolist(), labels.tolist())):
+            reviews[i]['score'] = score
+            reviews[i]['sentiment'] = label
+            if keep_tokens:
+                reviews[i]['token_ids'] = encoded_reviews[i]
 
         return reviews
 
     except Exception as e:
         raise RuntimeError(f"Error during sentiment prediction: {e}")
+
+def explain(review: dict, token_budget: int = explain_token_budget, cascade: bool = cascade_enabled) -> dict:
+    """
+    Per-word attribution of a review's score by occlusion.
+
+    Every word span is removed in turn and the drop in score is its weight.
+    All occluded variants are scored together in one batch; reviews longer
+    than `token_budget` words are occluded in contiguous spans so the cost
+    never exceeds `token_budget + 1` model rows. All variants are scored by the
+    model that `predict` used for the review (with the cascade, the RNN if the
+    review falls in `cascade_band`, else the linear model), so 'score' matches
+    the stored score and every weight compares outputs of the same model.
+
+    Args:
+        review (dict): Must contain 'title' and 'content' keys.
+        token_budget (int): Maximum number of occluded variants.
+        cascade (bool): Score through the linear -> RNN cascade, as `predict` does by default.
+
+    Returns:
+        dict: 'tokens' (words of title + content), 'weights' (positive values
+        pushed the score up), 'span' (words per occluded span) and 'score'.
+    """
+    if not isinstance(review, dict) or 'title' not in review or 'content' not in review:
+        raise KeyError("Review must have 'title' and 'content' keys.")
+
+    text = review['title'] + " " + review['content']
+    words = text.split()
+    encoded = encode_review(text)  # encoded[0] is <START>, encoded[i + 1] is words[i]
+    if not words:
+        return {'tokens': [], 'weights': [], 'span': 1, 'score': None}
+
+    span = max(1, math.ceil(len(words) / token_budget))
+    starts = range(0, len(words), span)
+    variants = [encoded] + [encoded[:1 + start] + encoded[1 + start + span:] for start in starts]
+
+    # the cascade picks one model from the review itself, variants routed on their own would mix models
+    use_rnn = True
+    if cascade and fast_model is not None:
+        low, high = cascade_band
+        original = _fast_scores([encoded])[0]
+        use_rnn = low < original < high
+    scores = batched_scores(variants, cascade=False) if use_rnn else _fast_scores(variants)
+    deltas = scores[0] - scores[1:]
+    weights = np.repeat(deltas, span)[:len(words)]
+
+    return {
+        'tokens': words,
+        'weights': [round(float(w), 4) for w in weights],
+        'span': span,
+        'score': round(float(scores[0]), 4),
+    }
     
 
 # For Testing
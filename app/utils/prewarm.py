@@ -0,0 +1,150 @@
+import re
+import time
+import threading
+from datetime import datetime, timedelta
+
+from config import prewarm_stale_hours, prewarm_titles_per_minute, prewarm_interval_minutes, prewarm_top_titles
+from utils.movie_api import fetch_movie_details, load_cached_details, search_movie_ids
+from utils.analysis_store import load_analysis, refresh_analysis
+from utils.image_cache import cached_thumbnail
+from utils.query_log import popular_titles
+from utils.profiling import profiled
+
+# Pre-warming fills the caches the interactive path reads (OMDb details, poster
+# thumbnails, stored analyses and the warehouse), so popular titles open instantly.
+
+IMDB_ID = re.compile(r'^tt\d{7,}$')
+
+def _is_fresh(analysis: dict, stale_hours: float) -> bool:
+    if not analysis or not analysis.get('last_crawl'):
+        return False
+    return analysis['last_crawl'] >= (datetime.now() - timedelta(hours=stale_hours)).isoformat(timespec='seconds')
+
+def resolve_title(entry: str) -> str:
+    """imdbID of a title list entry, either an imdbID or a title searched on OMDb (best match)."""
+    entry = entry.strip()
+    if IMDB_ID.match(entry):
+        return entry
+    results = search_movie_ids(entry, max_results=1)
+    return results[0]['imdbID'] if results else None
+
+def prewarm_title(imdb_id: str, stale_hours: float = prewarm_stale_hours) -> dict:
+    """
+    Refresh the details, poster and review analysis of one title if they are stale.
+
+    Args:
+        imdb_id (str): IMDb ID of the title.
+        stale_hours (float): Cached data younger than this is kept as is.
+
+    Returns:
+        dict: 'imdbID', 'title', 'status' ('fresh', 'analyzed', 'refreshed', 'not found'
+        or 'failed: ...'), 'new_reviews' and 'seconds'.
+    """
+    start = time.perf_counter()
+    row = {'imdbID': imdb_id, 'title': None, 'status': 'fresh', 'new_reviews': 0}
+    try:
+        movie = load_cached_details(imdb_id, max_age_hours=stale_hours) or fetch_movie_details(imdb_id, refresh=True)
+        if not movie:
+            row['status'] = 'not found'
+        else:
+            row['title'] = movie.get('Title')
+            poster = movie.get('Poster')
+            if poster and poster != 'N/A':
+                cached_thumbnail(poster)
+
+            analysis = load_analysis(imdb_id)
+            if not _is_fresh(analysis, stale_hours):
+                row['status'] = 'refreshed' if analysis else 'analyzed'
+                with profiled('prewarm', imdb_id):
+                    _, row['new_reviews'] = refresh_analysis(imdb_id, analysis, movie)
+    except Exception as e:
+        row['status'] = f"failed: {e}"
+
+    row['seconds'] = round(time.perf_counter() - start, 2)
+    return row
+
+def cache_hit_rate(imdb_ids: list[str], stale_hours: float = prewarm_stale_hours) -> float:
+    """Share of the requests (repeats count) whose title has cached details and a fresh analysis."""
+    if not imdb_ids:
+        return 0.0
+    fresh = {
+        imdb_id: bool(load_cached_details(imdb_id, max_age_hours=stale_hours))
+        and _is_fresh(load_analysis(imdb_id), stale_hours)
+        for imdb_id in set(imdb_ids)
+    }
+    return sum(fresh[imdb_id] for imdb_id in imdb_ids) / len(imdb_ids)
+
+def prewarm(entries: list[str], stale_hours: float = prewarm_stale_hours,
+            titles_per_minute: float = prewarm_titles_per_minute, stop: threading.Event = None) -> list[dict]:
+    """
+    Pre-warm a list of titles, rate limited.
+
+    Titles that needed network work are spaced at least `60 / titles_per_minute`
+    seconds apart; titles that were still fresh do not count against the limit.
+
+    Args:
+        entries (list): imdbIDs or titles.
+        stale_hours (float): Cached data younger than this is kept as is.
+        titles_per_minute (float): Upper bound on refreshed titles per minute.
+        stop (threading.Event): Optional, ends the run early when set.
+
+    Returns:
+        list[dict]: One `prewarm_title` row per entry, with the original 'entry'.
+    """
+    interval = 60 / titles_per_minute if titles_per_minute else 0
+    next_start = 0.0
+    rows = []
+    for entry in entries:
+        wait = next_start - time.monotonic()
+        if stop is not None and stop.wait(max(wait, 0)):
+            break
+        if stop is None and wait > 0:
+            time.sleep(wait)
+
+        started = time.monotonic()
+        try:
+            imdb_id, status = resolve_title(entry), 'not found'
+        except Exception as e:
+            imdb_id, status = None, f"failed: {e}"
+
+        if imdb_id:
+            row = prewarm_title(imdb_id, stale_hours)
+        else:
+            row = {'imdbID': None, 'title': None, 'status': status, 'new_reviews': 0, 'seconds': 0.0}
+        rows.append({'entry': entry, **row})
+
+        # a title search or a refresh went to the network, the next title waits its turn
+        if row['status'] != 'fresh' or not IMDB_ID.match(entry.strip()):
+            next_start = started + interval
+    return rows
+
+def start_prewarm_thread(entries: list[str] = None, interval_minutes: float = prewarm_interval_minutes,
+                         top: int = prewarm_top_titles, stale_hours: float = prewarm_stale_hours,
+                         titles_per_minute: float = prewarm_titles_per_minute) -> threading.Event:
+    """
+    Pre-warm on a schedule in a daemon thread.
+
+    Args:
+        entries (list): Fixed title list, the `top` most requested titles of the
+            query log are used (re-read every cycle) if None.
+        interval_minutes (float): Pause between two runs.
+        top (int): Titles taken from the query log.
+        stale_hours (float): Cached data younger than this is kept as is.
+        titles_per_minute (float): Upper bound on refreshed titles per minute.
+
+    Returns:
+        threading.Event: Set it to stop the thread.
+    """
+    stop = threading.Event()
+
+    def run():
+        while not stop.is_set():
+            targets = entries if entries is not None else popular_titles(top=top)
+            rows = prewarm(targets, stale_hours, titles_per_minute, stop)
+            refreshed = sum(row['status'] in ('analyzed', 'refreshed') for row in rows)
+            failed = sum(row['status'].startswith('failed') for row in rows)
+            print(f"[Prewarm] {len(rows)} titles checked, {refreshed} refreshed, {failed} failed")
+            stop.wait(interval_minutes * 60)
+
+    threading.Thread(target=run, name="prewarm", daemon=True).start()
+    return stop
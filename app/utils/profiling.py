@@ -0,0 +1,220 @@
+import os
+import sys
+import json
+import html
+import time
+import zlib
+import functools
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+import streamlit as st
+
+from config import profile_dir, profile_sample_interval_ms, profile_top_n
+
+# On-demand profiling of single interactions. Enabled per process with REELFEEL_PROFILE=1
+# or per browser tab with `?profile=1`; when off, a wrapped call only pays for that check.
+PROFILE_ENV = 'REELFEEL_PROFILE'
+
+# besides the interacting thread, threads doing work on its behalf are sampled too
+PROFILED_THREADS = ('inference-worker',)
+
+# one profile at a time: the sampler and tracemalloc are process-wide
+_profile_lock = threading.Lock()
+_active = threading.local()
+
+def profiling_enabled() -> bool:
+    """True if the env switch is set or the current page was opened with `?profile=1`."""
+    if os.environ.get(PROFILE_ENV, '') not in ('', '0'):
+        return True
+    try:
+        return st.query_params.get('profile') in ('1', 'true')
+    except Exception:
+        return False  # outside a Streamlit session
+
+def _stack(frame) -> list[str]:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return names[::-1]
+
+def _sample(thread_ids: dict, interval: float, stop: threading.Event, stacks: Counter) -> None:
+    while not stop.wait(interval):
+        for thread in threading.enumerate():
+            if thread.name in PROFILED_THREADS:
+                thread_ids.setdefault(thread.ident, thread.name)
+        frames = sys._current_frames()
+        for ident, name in thread_ids.items():
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = _stack(frame)
+            # an idle worker is only waiting for requests
+            if name in PROFILED_THREADS and any(n.startswith('_collect_batch ') for n in stack):
+                continue
+            stacks[';'.join([name] + stack)] += 1
+
+def flame_graph_svg(stacks: Counter, title: str, width: int = 1200, row: int = 16) -> str:
+    """Self-contained SVG flame graph of collapsed stacks ('a;b;c' -> samples), hover for details."""
+    total = sum(stacks.values()) or 1
+    tree = {'count': 0, 'children': {}}
+    for stack, count in stacks.items():
+        node = tree
+        node['count'] += count
+        for name in stack.split(';'):
+            node = node['children'].setdefault(name, {'count': 0, 'children': {}})
+            node['count'] += count
+
+    rects = []
+    def layout(name: str, node: dict, x: float, depth: int) -> None:
+        w = node['count'] / total * width
+        if w < 0.5:
+            return
+        rects.append((name, node['count'], x, depth, w))
+        for child_name, child in sorted(node['children'].items()):
+            layout(child_name, child, x, depth + 1)
+            x += child['count'] / total * width
+
+    layout('all', tree, 0.0, 0)
+    depth = max((r[3] for r in rects), default=0) + 1
+    height = depth * row + 40
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">',
+        f'<text x="4" y="16" font-size="14">{html.escape(title)} ({total} samples)</text>',
+    ]
+    for name, count, x, level, w in rects:
+        y = height - (level + 1) * row
+        hue = zlib.crc32(name.encode('utf-8')) % 50  # warm colours, stable per function
+        label = html.escape(name if len(name) * 6.5 < w - 4 else name[:max(int((w - 4) / 6.5) - 2, 0)] + '..')
+        parts.append(
+            f'<g><title>{html.escape(name)}: {count} samples ({100 * count / total:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row - 1}" fill="hsl({hue},85%,60%)"/>'
+            + (f'<text x="{x + 2:.1f}" y="{y + row - 4}">{label}</text>' if w > 20 else '') + '</g>'
+        )
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+def _hot_functions(stacks: Counter, top: int) -> tuple:
+    self_counts, total_counts = Counter(), Counter()
+    for stack, count in stacks.items():
+        names = stack.split(';')[1:]  # drop the thread name
+        if names:
+            self_counts[names[-1]] += count
+        for name in set(names):
+            total_counts[name] += count
+    return self_counts.most_common(top), total_counts.most_common(top)
+
+def _write_report(run_dir: str, meta: dict, stacks: Counter, allocations: list, top: int) -> None:
+    total = sum(stacks.values()) or 1
+    self_top, total_top = _hot_functions(stacks, top)
+
+    lines = [f"{meta['interaction']} imdbID={meta['imdbID']} wall={meta['seconds']:.3f}s "
+             f"samples={meta['samples']} peak_traced={meta['peak_traced_mb']:.1f}MB", ""]
+    for heading, rows in [("Top functions by self time", self_top), ("Top functions by total time", total_top)]:
+        lines.append(heading)
+        lines += [f"  {100 * count / total:6.1f}%  {count:6d}  {name}" for name, count in rows]
+        lines.append("")
+    lines.append("Top allocation sites (growth during the interaction)")
+    lines += [f"  {stat.size_diff / 1024:10.1f} KiB  {stat.count_diff:+8d} blocks  {stat.traceback}" for stat in allocations]
+
+    with open(os.path.join(run_dir, 'report.txt'), 'w', encoding='utf-8') as file:
+        file.write('\n'.join(lines) + '\n')
+    with open(os.path.join(run_dir, 'stacks.folded'), 'w', encoding='utf-8') as file:
+        file.writelines(f"{stack} {count}\n" for stack, count in stacks.items())
+    with open(os.path.join(run_dir, 'flamegraph.svg'), 'w', encoding='utf-8') as file:
+        file.write(flame_graph_svg(stacks, f"{meta['interaction']} {meta['imdbID'] or ''}".strip()))
+    with open(os.path.join(run_dir, 'meta.json'), 'w', encoding='utf-8') as file:
+        json.dump(meta, file, indent=2)
+
+@contextmanager
+def profiled(interaction: str, imdb_id: str = None, enabled: bool = None):
+    """
+    Profile the enclosed block: stack samples, a flame graph and allocation growth.
+
+    Writes `flamegraph.svg`, `stacks.folded` (flamegraph.pl/speedscope format),
+    `report.txt` (top-N functions and allocation sites) and `meta.json` into
+    `<profile_dir>/<timestamp>_<interaction>_<imdbID>/`. A block nested in an
+    active profile adds its interaction and imdbID to that profile instead.
+
+    Args:
+        interaction (str): Name of the interaction, e.g. 'rerun' or 'analysis'.
+        imdb_id (str): Title the interaction is about, if any.
+        enabled (bool): Profile only if True, checks `profiling_enabled()` if None.
+
+    Yields:
+        dict: Metadata of the active profile, None when not profiling.
+    """
+    if enabled is None:
+        enabled = profiling_enabled()
+    active = getattr(_active, 'meta', None)
+    if not enabled or active is not None:
+        if enabled and active is not None:
+            active['interaction'] += f"+{interaction}"
+            active['imdbID'] = active['imdbID'] or imdb_id
+        yield active
+        return
+    if not _profile_lock.acquire(blocking=False):
+        yield None  # another session is being profiled
+        return
+
+    meta = {'interaction': interaction, 'imdbID': imdb_id, 'started': datetime.now().isoformat(timespec='seconds')}
+    stacks, stop = Counter(), threading.Event()
+    thread_ids = {threading.get_ident(): threading.current_thread().name}
+    sampler = threading.Thread(target=_sample, name="profile-sampler", daemon=True,
+                               args=(thread_ids, profile_sample_interval_ms / 1000, stop, stacks))
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    _active.meta = meta
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        yield meta
+    finally:
+        meta['seconds'] = time.perf_counter() - start
+        stop.set()
+        sampler.join()
+        _active.meta = None
+        try:
+            after = tracemalloc.take_snapshot()
+            meta['peak_traced_mb'] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            if started_tracing:
+                tracemalloc.stop()
+            allocations = after.compare_to(before, 'lineno')[:profile_top_n]
+
+            meta['samples'] = sum(stacks.values())
+            name = '_'.join(part for part in (datetime.now().strftime('%Y%m%d-%H%M%S-%f'), meta['interaction'], meta['imdbID']) if part)
+            run_dir = os.path.join(profile_dir, name.replace('+', '-'))
+            os.makedirs(run_dir, exist_ok=True)
+            _write_report(run_dir, meta, stacks, allocations, profile_top_n)
+            print(f"[Profile] {meta['interaction']} took {meta['seconds']:.3f}s, written to {run_dir}")
+        except Exception as e:
+            print(f"[Warning] Could not write profile: {e}")
+        finally:
+            _profile_lock.release()
+
+def profile_interaction(interaction: str, imdb_id=None):
+    """
+    Decorator form of `profiled` for Streamlit entry points and fragments.
+
+    Args:
+        interaction (str): Name of the interaction.
+        imdb_id (callable): Optional, gets the call's arguments and returns the imdbID to tag.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # fragments rendered within a full rerun belong to the rerun's profile
+            if getattr(_active, 'meta', None) is not None or not profiling_enabled():
+                return func(*args, **kwargs)
+            with profiled(interaction, imdb_id(*args, **kwargs) if imdb_id else None, enabled=True):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
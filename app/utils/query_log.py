@@ -0,0 +1,60 @@
+import os
+import json
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+from config import query_log_path
+
+_log_lock = threading.Lock()
+
+def log_event(kind: str, **fields) -> None:
+    """
+    Append one interaction to the query log, failures never reach the user.
+
+    Args:
+        kind (str): 'search', 'view' (first time a title is shown in a session) or 'analyze'.
+        **fields: Event data, e.g. query, imdbID, hit.
+    """
+    event = {'time': datetime.now().isoformat(timespec='seconds'), 'kind': kind, **fields}
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(query_log_path) or '.', exist_ok=True)
+            with open(query_log_path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(event) + '\n')
+    except OSError as e:
+        print(f"[Warning] Could not write query log: {e}")
+
+def read_events(days: float = 7, path: str = query_log_path) -> list[dict]:
+    """Events of the last `days` days, oldest first."""
+    if not os.path.exists(path):
+        return []
+    since = (datetime.now() - timedelta(days=days)).isoformat(timespec='seconds')
+    events = []
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue  # partially written line
+            if event.get('time', '') >= since:
+                events.append(event)
+    return events
+
+def requested_titles(days: float = 7, path: str = query_log_path) -> list[str]:
+    """
+    imdbID of every title request of the last `days` days, with repeats.
+
+    Views and analyses are one request each, a search is one request for its best match.
+    """
+    requested = []
+    for event in read_events(days, path):
+        if event['kind'] in ('view', 'analyze') and event.get('imdbID'):
+            requested.append(event['imdbID'])
+        elif event['kind'] == 'search' and event.get('imdbIDs'):
+            requested.append(event['imdbIDs'][0])
+    return requested
+
+def popular_titles(days: float = 7, top: int = 200, path: str = query_log_path) -> list[str]:
+    """Most requested imdbIDs of the last `days` days, most requested first."""
+    return [imdb_id for imdb_id, _ in Counter(requested_titles(days, path)).most_common(top)]
@@ -0,0 +1,128 @@
+import numpy as np
+
+SENTIMENTS = ('POSITIVE', 'NEGATIVE', 'NEUTRAL')
+
+# Fixed histogram edges so histograms from different crawls can be added together
+SCORE_BINS = np.linspace(0.0, 1.0, 21)
+LENGTH_BIN_WIDTH = 200
+LENGTH_BINS = np.arange(0, 10000 + LENGTH_BIN_WIDTH, LENGTH_BIN_WIDTH)
+
+def _empty_stats() -> dict:
+    return {'count': 0, 'mean': 0.0, 'm2': 0.0, 'min': None, 'max': None}
+
+def _stats(values: np.ndarray) -> dict:
+    """Count, mean, sum of squared deviations (Welford's M2), min and max of `values`."""
+    if len(values) == 0:
+        return _empty_stats()
+    mean = float(values.mean())
+    return {
+        'count': int(len(values)),
+        'mean': mean,
+        'm2': float(((values - mean) ** 2).sum()),
+        'min': float(values.min()),
+        'max': float(values.max()),
+    }
+
+def _merge_stats(a: dict, b: dict) -> dict:
+    """Combine two stats dicts with Chan et al.'s parallel variance update."""
+    if a['count'] == 0:
+        return dict(b)
+    if b['count'] == 0:
+        return dict(a)
+
+    count = a['count'] + b['count']
+    delta = b['mean'] - a['mean']
+    return {
+        'count': count,
+        'mean': a['mean'] + delta * b['count'] / count,
+        'm2': a['m2'] + b['m2'] + delta ** 2 * a['count'] * b['count'] / count,
+        'min': min(a['min'], b['min']),
+        'max': max(a['max'], b['max']),
+    }
+
+def stats_std(stats: dict) -> float:
+    """Sample standard deviation (ddof=1, same as pandas) of a stats dict."""
+    if stats['count'] < 2:
+        return float('nan')
+    return (stats['m2'] / (stats['count'] - 1)) ** 0.5
+
+def _histogram(values: np.ndarray, edges: np.ndarray) -> list[int]:
+    # values beyond the last edge are counted in the last bin
+    return np.histogram(np.clip(values, edges[0], edges[-1]), bins=edges)[0].tolist()
+
+def empty_aggregates() -> dict:
+    """Aggregates of zero reviews, the identity element of `merge_aggregates`."""
+    return {
+        'count': 0,
+        'sentiment_counts': {s: 0 for s in SENTIMENTS},
+        'score': _empty_stats(),
+        'content_length': _empty_stats(),
+        'by_sentiment': {s: {'score': _empty_stats(), 'content_length': _empty_stats()} for s in SENTIMENTS},
+        'score_hist': [0] * (len(SCORE_BINS) - 1),
+        'length_hist': [0] * (len(LENGTH_BINS) - 1),
+    }
+
+def aggregate_reviews(reviews: list[dict]) -> dict:
+    """
+    Compute mergeable aggregates for a batch of scored reviews.
+
+    Args:
+        reviews (list): Review dicts with 'content', 'score' and 'sentiment' keys.
+
+    Returns:
+        dict: JSON-serializable aggregates (counts, Welford stats and histograms).
+    """
+    aggregates = empty_aggregates()
+    if not reviews:
+        return aggregates
+
+    scores = np.array([float(r['score']) for r in reviews])
+    lengths = np.array([len(r.get('content') or '') for r in reviews], dtype=np.float64)
+    labels = np.array([r['sentiment'] for r in reviews])
+
+    aggregates['count'] = len(reviews)
+    aggregates['score'] = _stats(scores)
+    aggregates['content_length'] = _stats(lengths)
+    aggregates['score_hist'] = _histogram(scores, SCORE_BINS)
+    aggregates['length_hist'] = _histogram(lengths, LENGTH_BINS)
+
+    for label in SENTIMENTS:
+        mask = labels == label
+        aggregates['sentiment_counts'][label] = int(mask.sum())
+        aggregates['by_sentiment'][label] = {
+            'score': _stats(scores[mask]),
+            'content_length': _stats(lengths[mask]),
+        }
+
+    return aggregates
+
+def merge_aggregates(a: dict, b: dict) -> dict:
+    """Fold two aggregates together, equal to aggregating both review sets at once."""
+    return {
+        'count': a['count'] + b['count'],
+        'sentiment_counts': {s: a['sentiment_counts'][s] + b['sentiment_counts'][s] for s in SENTIMENTS},
+        'score': _merge_stats(a['score'], b['score']),
+        'content_length': _merge_stats(a['content_length'], b['content_length']),
+        'by_sentiment': {
+            s: {
+                key: _merge_stats(a['by_sentiment'][s][key], b['by_sentiment'][s][key])
+                for key in ('score', 'content_length')
+            }
+            for s in SENTIMENTS
+        },
+        'score_hist': [x + y for x, y in zip(a['score_hist'], b['score_hist'])],
+        'length_hist': [x + y for x, y in zip(a['length_hist'], b['length_hist'])],
+    }
+
+def histogram_median(hist: list[int], edges: np.ndarray) -> float:
+    """Median estimated by linear interpolation inside the histogram bin that holds it."""
+    counts = np.asarray(hist, dtype=np.float64)
+    total = counts.sum()
+    if total == 0:
+        return float('nan')
+
+    cumulative = np.cumsum(counts)
+    i = int(np.searchsorted(cumulative, total / 2))
+    before = cumulative[i - 1] if i > 0 else 0.0
+    fraction = (total / 2 - before) / counts[i] if counts[i] else 0.0
+    return float(edges[i] + fraction * (edges[i + 1] - edges[i]))
@@ -1,22 +1,46 @@
+import hashlib
 import requests
 import pandas as pd
 
+from datetime import datetime
+
 from bs4 import BeautifulSoup
 from config import search_movie_url, request_headers
-from config import class_names, review_container_class
+from config import class_names, review_container_class, review_date_format, review_pagination_class
+
+def _review_id(card, title: str, content: str) -> str:
+    """IMDb review id (rw...) from the review permalink, or a content hash if there is none."""
+    link = card.find('a', href=lambda href: href and '/review/rw' in href)
+    if link:
+        return link['href'].split('/review/')[1].split('/')[0]
+    return hashlib.sha1(f"{title}|{content}".encode('utf-8')).hexdigest()[:16]
+
+def _review_date(card) -> str:
+    """Review submission date as ISO string (YYYY-MM-DD), None if missing or unparsable."""
+    date = card.find(class_=class_names['date'])
+    if not date:
+        return None
+    try:
+        return datetime.strptime(date.get_text(strip=True), review_date_format).date().isoformat()
+    except ValueError:
+        return None
 
-def get_reviews(movie_id: str, spoiler_free: bool = True) -> pd.DataFrame:
-    """Scrape user reviews for a given IMDb movie ID.
+def get_review_page(movie_id: str, spoiler_free: bool = True, newest_first: bool = False,
+                    pagination_key: str = None) -> tuple:
+    """Scrape one page of user reviews for a given IMDb movie ID.
 
     Args:
         movie_id (str): IMDb ID of the movie (e.g., 'tt1234567')
         spoiler_free (bool): Whether to exclude reviews with spoilers
+        newest_first (bool): Sort reviews by submission date, newest first
+        pagination_key (str): Key of the page to fetch, the first page if None
 
     Returns:
-        pd.DataFrame: DataFrame containing title, rating, and content of reviews
+        tuple: (reviews, key of the next page or None), (None, None) on errors
     """
     try:
-        url = search_movie_url(movie_id=movie_id, spoiler_free=spoiler_free)
+        url = search_movie_url(movie_id=movie_id, spoiler_free=spoiler_free, newest_first=newest_first,
+                               pagination_key=pagination_key)
         response = requests.get(url, headers=request_headers)
 
         if response.status_code != 200:
@@ -31,20 +55,39 @@ def get_reviews(movie_id: str, spoiler_free: bool = True) -> pd.DataFrame:
             title = container.find('h3', class_=class_names['title'])
             content = container.find('div', class_=class_names['content'])
 
+            # permalink and date sit in the surrounding review card, not the content block
+            card = container.find_parent('article') or container
+
             review = {
                 'rating': rating.get_text(strip=True) if rating else None,
                 'title': title.get_text(strip=True) if title else None,
                 'content': content.get_text(strip=True) if content else None
             }
+            review['review_id'] = _review_id(card, review['title'], review['content'])
+            review['date'] = _review_date(card)
 
             if review['content']:
                 reviews.append(review)
 
-        return reviews
+        load_more = soup.find(class_=review_pagination_class)
+        return reviews, (load_more.get('data-key') or None) if load_more else None
 
     except Exception as e:
         print(f"[Error] Could not fetch reviews for {movie_id}: {e}")
-        return None
+        return None, None
+
+def get_reviews(movie_id: str, spoiler_free: bool = True, newest_first: bool = False) -> list[dict]:
+    """Scrape the first page of user reviews for a given IMDb movie ID.
+
+    Args:
+        movie_id (str): IMDb ID of the movie (e.g., 'tt1234567')
+        spoiler_free (bool): Whether to exclude reviews with spoilers
+        newest_first (bool): Sort reviews by submission date, newest first
+
+    Returns:
+        list: Dicts with id, date, title, rating, and content of reviews, None on errors
+    """
+    return get_review_page(movie_id, spoiler_free, newest_first)[0]
 
 # For testing
 # if __name__ == "__main__":
@@ -0,0 +1,206 @@
+import os
+import re
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import warehouse_dir
+from utils.review_aggregates import stats_std
+
+MOVIES_FILE = os.path.join(warehouse_dir, 'movies.parquet')
+REVIEWS_DIR = os.path.join(warehouse_dir, 'reviews')
+
+REVIEW_COLUMNS = ['review_id', 'date', 'rating', 'title', 'content', 'score', 'sentiment']
+MOVIE_COLUMNS = [
+    'imdbID', 'title', 'year', 'genres', 'directors', 'imdbRating', 'review_count',
+    'positive', 'negative', 'neutral', 'positive_share', 'score_mean', 'score_std', 'last_crawl',
+]
+
+_write_lock = threading.Lock()
+
+# In-memory indexes over movies.parquet, rebuilt when the file changes
+_index = {'mtime': None}
+
+def _split_names(value: str) -> list[str]:
+    if not value or value == 'N/A':
+        return []
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+def _year(value: str) -> int:
+    # OMDb years look like "1999" or "2010–2014" for series
+    match = re.match(r'\d{4}', str(value or ''))
+    return int(match.group()) if match else None
+
+def _movie_row(movie: dict, analysis: dict) -> dict:
+    aggregates = analysis['aggregates']
+    counts = aggregates['sentiment_counts']
+    total = aggregates['count']
+    try:
+        imdb_rating = float(movie.get('imdbRating'))
+    except (TypeError, ValueError):
+        imdb_rating = None
+
+    return {
+        'imdbID': movie['imdbID'],
+        'title': movie.get('Title'),
+        'year': _year(movie.get('Year')),
+        'genres': _split_names(movie.get('Genre')),
+        'directors': _split_names(movie.get('Director')),
+        'imdbRating': imdb_rating,
+        'review_count': total,
+        'positive': counts['POSITIVE'],
+        'negative': counts['NEGATIVE'],
+        'neutral': counts['NEUTRAL'],
+        'positive_share': counts['POSITIVE'] / total if total else None,
+        'score_mean': aggregates['score']['mean'],
+        'score_std': stats_std(aggregates['score']),
+        'last_crawl': analysis.get('last_crawl'),
+    }
+
+def _write_parquet(df: pd.DataFrame, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path)
+    os.replace(tmp_path, path)
+
+def record_analysis(movie: dict, analysis: dict) -> None:
+    """
+    Store a movie's OMDb metadata, scored reviews and aggregates in the warehouse.
+
+    Reviews are written to their own imdbID partition, the movie row (with its
+    precomputed aggregates) replaces any previous row for the same title.
+
+    Args:
+        movie (dict): OMDb movie data, must contain 'imdbID'
+        analysis (dict): Stored analysis as returned by `refresh_analysis`
+    """
+    imdb_id = movie['imdbID']
+    reviews = pd.DataFrame(analysis['reviews']).reindex(columns=REVIEW_COLUMNS)
+    reviews['score'] = pd.to_numeric(reviews['score'], errors='coerce')
+    for col in ['review_id', 'date', 'rating', 'title', 'content', 'sentiment']:
+        reviews[col] = reviews[col].astype('string')
+
+    with _write_lock:
+        _write_parquet(reviews, os.path.join(REVIEWS_DIR, f'imdbID={imdb_id}', 'part-0.parquet'))
+
+        row = pd.DataFrame([_movie_row(movie, analysis)], columns=MOVIE_COLUMNS)
+        movies = load_movies()
+        movies = movies[movies['imdbID'] != imdb_id]
+        movies = pd.concat([movies, row], ignore_index=True) if not movies.empty else row
+        _write_parquet(movies, MOVIES_FILE)
+
+def load_movies() -> pd.DataFrame:
+    """All warehouse movie rows with their aggregates, empty DataFrame if none were recorded."""
+    if not os.path.exists(MOVIES_FILE):
+        return pd.DataFrame(columns=MOVIE_COLUMNS)
+    return pq.read_table(MOVIES_FILE).to_pandas()
+
+def load_reviews(imdb_id: str) -> pd.DataFrame:
+    """Scored reviews of one movie, read from its partition only."""
+    path = os.path.join(REVIEWS_DIR, f'imdbID={imdb_id}')
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=REVIEW_COLUMNS)
+    return pq.read_table(path).to_pandas()
+
+def _inverted_index(lists: pd.Series) -> dict:
+    """Map each lower-cased name to the sorted row positions that contain it."""
+    index = {}
+    for row, names in enumerate(lists):
+        for name in names if names is not None else []:
+            index.setdefault(name.lower(), []).append(row)
+    return {name: np.array(rows) for name, rows in index.items()}
+
+def _get_index() -> dict:
+    mtime = os.path.getmtime(MOVIES_FILE) if os.path.exists(MOVIES_FILE) else None
+    if _index['mtime'] != mtime or 'movies' not in _index:
+        movies = load_movies()
+        years = movies['year'].to_numpy(dtype=np.float64, na_value=np.nan)
+        _index.update({
+            'mtime': mtime,
+            'movies': movies,
+            'genre': _inverted_index(movies['genres']),
+            'director': _inverted_index(movies['directors']),
+            'year_order': np.argsort(years, kind='stable'),
+            'sorted_years': np.sort(years),
+        })
+    return _index
+
+def indexed_movies() -> pd.DataFrame:
+    """`load_movies`, read once per change of the movies file, do not modify the result."""
+    return _get_index()['movies']
+
+def query_movies(genres: list[str] = None, year_range: tuple = None, director: str = None) -> pd.DataFrame:
+    """
+    Movies matching all given filters, answered from the in-memory indexes.
+
+    Args:
+        genres (list): Movie must have at least one of these genres
+        year_range (tuple): Inclusive (first_year, last_year)
+        director (str): Movie must be directed by this person
+
+    Returns:
+        pd.DataFrame: Matching movie rows with their aggregates
+    """
+    index = _get_index()
+    rows = np.arange(len(index['movies']))
+
+    if genres:
+        matches = [index['genre'].get(g.lower(), np.array([], dtype=int)) for g in genres]
+        rows = np.intersect1d(rows, np.unique(np.concatenate(matches)))
+
+    if year_range:
+        first, last = year_range
+        lo = np.searchsorted(index['sorted_years'], first, side='left')
+        hi = np.searchsorted(index['sorted_years'], last, side='right')
+        rows = np.intersect1d(rows, index['year_order'][lo:hi])
+
+    if director:
+        rows = np.intersect1d(rows, index['director'].get(director.lower(), np.array([], dtype=int)))
+
+    return index['movies'].iloc[rows].reset_index(drop=True)
+
+def positive_share(movies: pd.DataFrame) -> dict:
+    """Review-weighted and per-movie average positive share of a set of movies."""
+    total = movies['review_count'].sum()
+    return {
+        'movies': len(movies),
+        'reviews': int(total),
+        'positive_share': float(movies['positive'].sum() / total) if total else float('nan'),
+        'mean_movie_positive_share': float(movies['positive_share'].mean()) if len(movies) else float('nan'),
+    }
+
+def group_summary(movies: pd.DataFrame, by: str) -> pd.DataFrame:
+    """
+    Positive share and average score per genre, director or decade.
+
+    Args:
+        movies (pd.DataFrame): Movie rows, e.g. the output of `query_movies`
+        by (str): 'genre', 'director' or 'decade'
+
+    Returns:
+        pd.DataFrame: One row per group
+    """
+    if movies.empty:
+        return pd.DataFrame(columns=[by, 'movies', 'reviews', 'positive_share', 'score_mean'])
+
+    df = movies.copy()
+    if by == 'decade':
+        df = df.dropna(subset=['year'])
+        df['decade'] = (df['year'].astype(int) // 10 * 10).astype(str) + 's'
+    elif by in ('genre', 'director'):
+        df = df.explode(f'{by}s').rename(columns={f'{by}s': by}).dropna(subset=[by])
+    else:
+        raise ValueError("by must be 'genre', 'director' or 'decade'.")
+
+    df['weighted_score'] = df['score_mean'] * df['review_count']
+    summary = df.groupby(by).agg(
+        movies=('imdbID', 'nunique'),
+        reviews=('review_count', 'sum'),
+        positive=('positive', 'sum'),
+        weighted_score=('weighted_score', 'sum'),
+    ).reset_index()
+    summary['positive_share'] = summary['positive'] / summary['reviews']
+    summary['score_mean'] = summary['weighted_score'] / summary['reviews']
+    return summary[[by, 'movies', 'reviews', 'positive_share', 'score_mean']]
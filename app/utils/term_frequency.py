@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from utils.predict_sentiment import word_index, encode_review
+
+# ids 0-3 are <PAD>, <START>, <UNK> and <UNUSED>
+RESERVED_IDS = 4
+
+STOP_WORDS = {
+    'a', 'an', 'the', 'and', 'or', 'but', 'if', 'of', 'to', 'in', 'on', 'at', 'by', 'for', 'with',
+    'from', 'as', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'am', 'it', "it's", 'its',
+    'this', 'that', 'these', 'those', 'i', 'me', 'my', 'we', 'our', 'you', 'your', 'he', 'him',
+    'his', 'she', 'her', 'they', 'them', 'their', 'what', 'which', 'who', 'whom', 'there', 'here',
+    'so', 'than', 'too', 'very', 'can', 'will', 'just', 'do', 'does', 'did', 'have', 'has', 'had',
+    'all', 'any', 'some', 'about', 'into', 'out', 'up', 'down', 'over', 'then', 'also', 'would',
+    'could', 'should', 'when', 'where', 'how', 'one', 'br', 'movie', 'film', 'movies', 'films',
+}
+
+# id -> word for decoding, and a boolean mask of ids that are never counted
+index_word = {v: k for k, v in word_index.items()}
+_vocab_size = max(word_index.values()) + 1
+_skip_ids = np.zeros(_vocab_size, dtype=bool)
+_skip_ids[:RESERVED_IDS] = True
+_skip_ids[[word_index[w] for w in STOP_WORDS if w in word_index]] = True
+
+def _token_ids(review: dict) -> np.ndarray:
+    ids = review.get('token_ids')
+    if ids is None:  # reviews analyzed before token ids were kept
+        ids = encode_review(review['title'] + " " + review['content'])
+    return np.asarray(ids, dtype=np.int64)
+
+def _top_k(keys: np.ndarray, counts: np.ndarray, k: int) -> tuple:
+    if len(counts) > k:
+        top = np.argpartition(counts, -k)[-k:]
+        keys, counts = keys[top], counts[top]
+    order = np.argsort(-counts, kind='stable')
+    return keys[order], counts[order]
+
+def _class_terms(sequences: list[np.ndarray], k: int) -> tuple:
+    """Top-k unigrams and bigrams of one group of reviews as (word, count) DataFrames."""
+    if not sequences:
+        empty = pd.DataFrame(columns=['term', 'count'])
+        return empty, empty
+
+    # unigrams: one bincount over all ids of the group
+    flat = np.concatenate(sequences)
+    counts = np.bincount(flat, minlength=_vocab_size)
+    counts[_skip_ids] = 0
+    ids, id_counts = _top_k(np.arange(len(counts)), counts, k)
+    keep = id_counts > 0
+    unigrams = pd.DataFrame({
+        'term': [index_word.get(i, '<UNK>') for i in ids[keep]],
+        'count': id_counts[keep],
+    })
+
+    # bigrams: pack (first, second) into one int64 id, pairs across reviews or with skipped ids are dropped
+    firsts = np.concatenate([seq[:-1] for seq in sequences])
+    seconds = np.concatenate([seq[1:] for seq in sequences])
+    valid = ~(_skip_ids[firsts] | _skip_ids[seconds])
+    pair_ids = firsts[valid] * _vocab_size + seconds[valid]
+    if len(pair_ids):
+        pairs, pair_counts = np.unique(pair_ids, return_counts=True)
+        pairs, pair_counts = _top_k(pairs, pair_counts, k)
+    else:
+        pairs, pair_counts = pair_ids, pair_ids
+    bigrams = pd.DataFrame({
+        'term': [f"{index_word.get(p // _vocab_size, '<UNK>')} {index_word.get(p % _vocab_size, '<UNK>')}" for p in pairs],
+        'count': pair_counts,
+    })
+    return unigrams, bigrams
+
+def top_terms(reviews: list[dict], k: int = 15) -> dict:
+    """
+    Most frequent words and bigrams per sentiment, counted from token ids.
+
+    Args:
+        reviews (list): Scored review dicts, ideally with 'token_ids' from `predict(keep_tokens=True)`.
+        k (int): Number of terms per sentiment.
+
+    Returns:
+        dict: sentiment -> {'unigrams': DataFrame, 'bigrams': DataFrame}
+    """
+    groups = {}
+    for review in reviews:
+        ids = _token_ids(review)
+        ids = ids[ids < _vocab_size]
+        groups.setdefault(review['sentiment'], []).append(ids)
+
+    terms = {}
+    for label, sequences in groups.items():
+        unigrams, bigrams = _class_terms(sequences, k)
+        terms[label] = {'unigrams': unigrams, 'bigrams': bigrams}
+    return terms
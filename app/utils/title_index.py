@@ -0,0 +1,220 @@
+import os
+import json
+import zlib
+import shutil
+import unicodedata
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from config import title_index_dir
+
+# Offline title index built from the IMDb title dataset by `python -m scripts.build_title_index`.
+# Everything is stored as flat NumPy arrays and opened memory-mapped:
+#   titles.bin + title_offsets.npy      display titles (utf-8), ids/years/votes/types per title
+#   keys.bin + key_offsets.npy          normalized titles sorted bytewise, key_order maps back to titles
+#   trigram_keys/offsets/postings.npy   sorted trigram hashes and the titles containing each (CSR)
+ARRAYS = ['ids', 'years', 'votes', 'types', 'title_offsets', 'key_order', 'key_offsets',
+          'trigram_keys', 'trigram_offsets', 'trigram_postings', 'trigram_counts']
+META_FILE = 'meta.json'
+
+# similarity is Jaccard over trigrams, popularity adds at most ~0.1 for the most voted titles
+MIN_SIMILARITY = 0.3
+POPULARITY_WEIGHT = 0.015
+
+# Memory-mapped index, reopened when the index is rebuilt
+_index = {'stamp': None}
+
+def normalize_title(title: str) -> str:
+    """Lower-case, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize('NFKD', str(title)).lower()
+    text = ''.join(ch if ch.isalnum() else ' ' for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.split())
+
+def _trigrams(key: str) -> np.ndarray:
+    padded = f"  {key} "
+    return np.unique(np.fromiter(
+        (zlib.crc32(padded[i:i + 3].encode('utf-8')) for i in range(len(padded) - 2)),
+        dtype=np.uint32,
+    ))
+
+def _concat(strings: list[bytes]) -> tuple:
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(s) for s in strings])
+    return np.frombuffer(b''.join(strings), dtype=np.uint8), offsets
+
+def build_title_index(titles: pd.DataFrame, index_dir: str = title_index_dir) -> int:
+    """
+    Build the offline title index.
+
+    Args:
+        titles (pd.DataFrame): Columns 'imdbID' ('tt…'), 'title', 'year', 'type' and 'votes'.
+        index_dir (str): Output directory, replaced if it exists. The index is built
+            in a sibling directory and swapped in by renaming, so a running app
+            keeps reading its memory-mapped old files until it reopens the index.
+
+    Returns:
+        int: Number of indexed titles.
+    """
+    titles = titles.reset_index(drop=True)
+    keys = [normalize_title(t) for t in titles['title']]
+
+    types = sorted(titles['type'].astype(str).unique())
+    arrays = {
+        'ids': titles['imdbID'].str[2:].astype(np.int32).to_numpy(),
+        'years': pd.to_numeric(titles['year'], errors='coerce').fillna(0).astype(np.int16).to_numpy(),
+        'votes': pd.to_numeric(titles['votes'], errors='coerce').fillna(0).astype(np.int32).to_numpy(),
+        'types': titles['type'].astype(str).map({t: i for i, t in enumerate(types)}).astype(np.uint8).to_numpy(),
+    }
+    title_bytes, arrays['title_offsets'] = _concat([str(t).encode('utf-8') for t in titles['title']])
+
+    # prefix structure: normalized keys in bytewise order, so a prefix is one contiguous range
+    encoded_keys = [k.encode('utf-8') for k in keys]
+    key_order = np.array(sorted(range(len(keys)), key=encoded_keys.__getitem__), dtype=np.int32)
+    key_bytes, arrays['key_offsets'] = _concat([encoded_keys[i] for i in key_order])
+    arrays['key_order'] = key_order
+
+    # trigram structure: postings of each trigram hash, grouped by sorting (hash, title)
+    grams = [_trigrams(k) for k in keys]
+    arrays['trigram_counts'] = np.array([len(g) for g in grams], dtype=np.uint16)
+    codes = np.concatenate(grams) if grams else np.zeros(0, dtype=np.uint32)
+    owners = np.repeat(np.arange(len(grams), dtype=np.int32), arrays['trigram_counts'])
+    order = np.lexsort((owners, codes))
+    codes, arrays['trigram_postings'] = codes[order], owners[order]
+    arrays['trigram_keys'], starts = np.unique(codes, return_index=True)
+    arrays['trigram_offsets'] = np.append(starts, len(codes)).astype(np.int64)
+
+    index_dir = os.path.normpath(index_dir)
+    build_dir = f"{index_dir}.build-{os.getpid()}"
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.makedirs(build_dir)
+    for name in ARRAYS:
+        np.save(os.path.join(build_dir, f"{name}.npy"), arrays[name])
+    title_bytes.tofile(os.path.join(build_dir, 'titles.bin'))
+    key_bytes.tofile(os.path.join(build_dir, 'keys.bin'))
+    with open(os.path.join(build_dir, META_FILE), 'w', encoding='utf-8') as file:
+        json.dump({'count': len(titles), 'types': types, 'built': datetime.now().isoformat(timespec='seconds')}, file)
+
+    # files that are mapped are never rewritten: the old directory is moved aside whole and
+    # readers reopen the new one when meta.json changes (searches fall back to OMDb meanwhile)
+    old_dir = f"{index_dir}.old-{os.getpid()}"
+    if os.path.exists(index_dir):
+        os.replace(index_dir, old_dir)
+    os.replace(build_dir, index_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)  # open mmaps keep their files alive on POSIX
+    return len(titles)
+
+def title_index_available(index_dir: str = title_index_dir) -> bool:
+    return os.path.exists(os.path.join(index_dir, META_FILE))
+
+def _get_index(index_dir: str = title_index_dir) -> dict:
+    meta_path = os.path.join(index_dir, META_FILE)
+    stat = os.stat(meta_path)
+    stamp = (stat.st_ino, stat.st_mtime_ns)  # a rebuilt index is a new directory with a new meta.json
+    if _index['stamp'] != stamp or _index.get('dir') != index_dir:
+        with open(meta_path, 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+        _index.clear()
+        _index.update({name: np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode='r') for name in ARRAYS})
+        for name in ('titles', 'keys'):
+            path = os.path.join(index_dir, f"{name}.bin")
+            # np.memmap cannot map an empty file
+            _index[name] = np.memmap(path, dtype=np.uint8, mode='r') if os.path.getsize(path) else np.zeros(0, np.uint8)
+        _index.update({'stamp': stamp, 'dir': index_dir, 'type_names': meta['types']})
+    return _index
+
+def _record(index: dict, row: int, similarity: float = None) -> dict:
+    start, end = index['title_offsets'][row], index['title_offsets'][row + 1]
+    year = int(index['years'][row])
+    record = {
+        'imdbID': f"tt{int(index['ids'][row]):07d}",
+        'Title': index['titles'][start:end].tobytes().decode('utf-8'),
+        'Year': str(year) if year else 'N/A',
+        'Type': index['type_names'][index['types'][row]],
+        'votes': int(index['votes'][row]),
+    }
+    if similarity is not None:
+        record['similarity'] = round(float(similarity), 3)
+    return record
+
+def search_titles(query: str, k: int = 10, min_similarity: float = MIN_SIMILARITY,
+                  index_dir: str = title_index_dir) -> list[dict]:
+    """
+    Ranked fuzzy title matches, typos and missing words still find the title.
+
+    Candidates are the titles sharing a trigram with the query; they are ranked
+    by trigram Jaccard similarity plus a small boost for popular titles.
+
+    Args:
+        query (str): Free-text title query.
+        k (int): Maximum number of matches.
+        min_similarity (float): Matches below this trigram similarity are dropped.
+        index_dir (str): Directory of the index.
+
+    Returns:
+        list[dict]: 'imdbID', 'Title', 'Year', 'Type', 'votes' and 'similarity' per match, best first.
+    """
+    key = normalize_title(query)
+    if not key:
+        return []
+
+    index = _get_index(index_dir)
+    query_grams = _trigrams(key)
+    trigram_keys, offsets = index['trigram_keys'], index['trigram_offsets']
+    positions = np.searchsorted(trigram_keys, query_grams)
+    found = positions < len(trigram_keys)
+    found[found] = trigram_keys[positions[found]] == query_grams[found]
+    positions = positions[found]
+    if not len(positions):
+        return []
+
+    postings = np.concatenate([index['trigram_postings'][offsets[p]:offsets[p + 1]] for p in positions])
+    candidates, shared = np.unique(postings, return_counts=True)
+    similarity = shared / (len(query_grams) + index['trigram_counts'][candidates] - shared)
+
+    keep = similarity >= min_similarity
+    candidates, similarity = candidates[keep], similarity[keep]
+    rank = similarity + POPULARITY_WEIGHT * np.log1p(index['votes'][candidates])
+    top = np.argsort(-rank, kind='stable')[:k] if len(rank) <= k else np.argpartition(-rank, k)[:k]
+    top = top[np.argsort(-rank[top], kind='stable')]
+    return [_record(index, int(candidates[i]), similarity[i]) for i in top]
+
+def _lower_bound(index: dict, key: bytes, lo: int = 0) -> int:
+    """First position in the sorted keys that is not below `key`, read straight from the memory map."""
+    offsets, keys = index['key_offsets'], index['keys']
+    hi = len(index['key_order'])
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if keys[offsets[mid]:offsets[mid + 1]].tobytes() < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def complete_titles(prefix: str, k: int = 5, index_dir: str = title_index_dir) -> list[dict]:
+    """
+    Autocomplete: the most voted titles whose normalized title starts with `prefix`.
+
+    Args:
+        prefix (str): Beginning of a title.
+        k (int): Maximum number of suggestions.
+        index_dir (str): Directory of the index.
+
+    Returns:
+        list[dict]: 'imdbID', 'Title', 'Year', 'Type' and 'votes' per suggestion, most voted first.
+    """
+    key = normalize_title(prefix).encode('utf-8')
+    if not key:
+        return []
+
+    index = _get_index(index_dir)
+    lo = _lower_bound(index, key)
+    hi = _lower_bound(index, key + b'\xff', lo)  # 0xff never occurs in utf-8
+    if lo == hi:
+        return []
+
+    rows = np.asarray(index['key_order'][lo:hi])
+    votes = np.asarray(index['votes'])[rows]
+    top = np.argsort(-votes, kind='stable')[:k] if len(rows) <= k else np.argpartition(-votes, k)[:k]
+    top = top[np.argsort(-votes[top], kind='stable')]
+    return [_record(index, int(rows[i])) for i in top]
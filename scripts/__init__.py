@@ -0,0 +1,12 @@
+"""
+Offline tooling for ReelFeel (model training, reports, cache maintenance).
+
+Run the modules from the repository root, e.g. `python -m scripts.train_linear`.
+The app sources live in `app/` and are imported the same way Streamlit does.
+"""
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
@@ -0,0 +1,84 @@
+"""
+Build the offline title index used for local fuzzy search and autocomplete.
+
+Reads the IMDb non-commercial datasets (https://datasets.imdbws.com/):
+`title.basics.tsv.gz` for id/title/year/type and, optionally,
+`title.ratings.tsv.gz` for vote counts. A CSV with imdbID, title, year, type
+and votes columns works as well.
+
+Usage:
+    python -m scripts.build_title_index --basics title.basics.tsv.gz --ratings title.ratings.tsv.gz --min-votes 50
+    python -m scripts.build_title_index --csv titles.csv
+"""
+import argparse
+import csv
+import time
+
+import pandas as pd
+
+from config import title_index_dir
+from utils.title_index import build_title_index, search_titles, complete_titles
+
+DEFAULT_TYPES = ['movie', 'tvMovie', 'tvSeries', 'tvMiniSeries', 'short', 'video']
+
+def _read_imdb_tsv(path: str, columns: list[str]) -> pd.DataFrame:
+    # IMDb TSVs use \N for missing values and contain stray quotes in titles
+    return pd.read_csv(path, sep='\t', usecols=columns, na_values='\\N', keep_default_na=False,
+                       quoting=csv.QUOTE_NONE, dtype=str)
+
+def load_titles(basics: str = None, ratings: str = None, csv_path: str = None,
+                types: list[str] = DEFAULT_TYPES, min_votes: int = 0) -> pd.DataFrame:
+    """Title table with 'imdbID', 'title', 'year', 'type' and 'votes' columns."""
+    if csv_path:
+        titles = pd.read_csv(csv_path, dtype={'imdbID': str, 'title': str, 'type': str})
+    else:
+        titles = _read_imdb_tsv(basics, ['tconst', 'titleType', 'primaryTitle', 'startYear'])
+        titles = titles.rename(columns={'tconst': 'imdbID', 'titleType': 'type',
+                                        'primaryTitle': 'title', 'startYear': 'year'})
+        if ratings:
+            votes = _read_imdb_tsv(ratings, ['tconst', 'numVotes']).rename(columns={'tconst': 'imdbID', 'numVotes': 'votes'})
+            titles = titles.merge(votes, on='imdbID', how='left')
+        else:
+            titles['votes'] = 0
+
+    titles['votes'] = pd.to_numeric(titles['votes'], errors='coerce').fillna(0).astype(int)
+    titles = titles.dropna(subset=['imdbID', 'title'])
+    if types:
+        titles = titles[titles['type'].isin(types)]
+    if min_votes:
+        titles = titles[titles['votes'] >= min_votes]
+    return titles[['imdbID', 'title', 'year', 'type', 'votes']]
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline title index.")
+    parser.add_argument('--basics', default=None, help="IMDb title.basics.tsv(.gz).")
+    parser.add_argument('--ratings', default=None, help="IMDb title.ratings.tsv(.gz) for vote counts.")
+    parser.add_argument('--csv', default=None, help="CSV with imdbID,title,year,type,votes instead of the TSVs.")
+    parser.add_argument('--types', nargs='*', default=DEFAULT_TYPES, help="Title types to keep, empty keeps all.")
+    parser.add_argument('--min-votes', type=int, default=0, help="Drop titles with fewer votes.")
+    parser.add_argument('--output', default=title_index_dir)
+    parser.add_argument('--probe', nargs='*', default=['the matrx', 'incepton', 'amelie'],
+                        help="Queries timed against the new index.")
+    args = parser.parse_args()
+
+    if not args.basics and not args.csv:
+        parser.error("either --basics or --csv is required")
+
+    start = time.perf_counter()
+    titles = load_titles(args.basics, args.ratings, args.csv, args.types, args.min_votes)
+    count = build_title_index(titles, args.output)
+    print(f"Indexed {count} titles into {args.output} in {time.perf_counter() - start:.1f}s")
+
+    for query in args.probe:
+        start = time.perf_counter()
+        matches = search_titles(query, index_dir=args.output)
+        search_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        suggestions = complete_titles(query[:4], index_dir=args.output)
+        complete_ms = (time.perf_counter() - start) * 1000
+        best = f"{matches[0]['Title']} ({matches[0]['Year']})" if matches else "-"
+        print(f"{query!r:>14}: search {search_ms:6.2f} ms -> {best} | "
+              f"complete {query[:4]!r} {complete_ms:6.2f} ms -> {[s['Title'] for s in suggestions[:3]]}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare RNN-only scoring against the linear -> RNN cascade on a labelled local sample.
+
+Usage:
+    python -m scripts.cascade_report --data path/to/imdb.npz --sample-size 2000 --bands 0.3:0.7 0.2:0.8
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.imdb_data import load_imdb, train_test_split
+from utils.predict_sentiment import rnn_scores, cascade_scores, sentiment_labels
+
+def _row(name, scores, elapsed, y, rnn_share, reference_labels):
+    labels = sentiment_labels(scores)
+    decided = labels != "NEUTRAL"
+    return {
+        'mode': name,
+        'accuracy': float(np.mean((scores > 0.5) == y)),
+        'accuracy_non_neutral': float(np.mean((scores[decided] > 0.5) == y[decided])) if decided.any() else float('nan'),
+        'agreement_with_rnn': float(np.mean(labels == reference_labels)),
+        'rnn_share': rnn_share,
+        'reviews_per_s': len(y) / elapsed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy/throughput report for cascade inference.")
+    parser.add_argument('--data', default=None, help="Local imdb.npz or labelled CSV (downloads the keras dataset if omitted).")
+    parser.add_argument('--sample-size', type=int, default=2000)
+    parser.add_argument('--bands', nargs='+', default=['0.4:0.6', '0.3:0.7', '0.25:0.75', '0.2:0.8'],
+                        help="Uncertainty bands as low:high.")
+    parser.add_argument('--output', default=None, help="Optional CSV path for the report.")
+    args = parser.parse_args()
+
+    sequences, labels = load_imdb(args.data)
+    # the linear model is trained on the first split, so only score the held-out part
+    _, (X, y) = train_test_split(sequences, labels)
+    X, y = X[:args.sample_size], y[:args.sample_size]
+    X = [list(x) for x in X]
+    print(f"Scoring {len(y)} labelled reviews")
+
+    start = time.perf_counter()
+    reference = rnn_scores(X)
+    elapsed = time.perf_counter() - start
+    reference_labels = sentiment_labels(reference)
+    rows = [_row("rnn-only", reference, elapsed, y, 1.0, reference_labels)]
+
+    for band in args.bands:
+        low, high = (float(v) for v in band.split(':'))
+        start = time.perf_counter()
+        scores, rnn_mask = cascade_scores(X, band=(low, high))
+        elapsed = time.perf_counter() - start
+        rows.append(_row(f"cascade {low:.2f}-{high:.2f}", scores, elapsed, y, float(rnn_mask.mean()), reference_labels))
+
+    report = pd.DataFrame(rows).round(4)
+    print(report.to_string(index=False))
+    if args.output:
+        report.to_csv(args.output, index=False)
+        print(f"Saved report to {args.output}")
+
+if __name__ == '__main__':
+    main()
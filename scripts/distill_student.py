@@ -0,0 +1,213 @@
+"""
+Distill the production RNN into a compact student model for CPU inference.
+
+The teacher scores every IMDB review once, padded exactly like at inference,
+and the student is trained on those scores (optionally mixed with the true
+labels) through the same length-bucketed tf.data pipeline as `train_rnn`.
+Teacher scores are cached in an .npz file so later runs skip that step.
+
+Usage:
+    python -m scripts.distill_student --data path/to/imdb.npz --epochs 5 --export
+    python -m scripts.distill_student --data path/to/imdb.npz --architecture rnn --dimension 64 --units 32
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.imdb_data import VOCABULARY_SIZE, load_imdb, train_test_split, bucketed_dataset
+from scripts.train_rnn import build_model, _throughput_callback, write_vocabulary, make_run_dir
+
+def build_student(architecture: str = 'conv', vocabulary_size: int = VOCABULARY_SIZE, dimension: int = 64,
+                  units: int = 32, filters: int = 64, kernel_size: int = 5):
+    """
+    Compact student model, same input/output contract as the production RNN.
+
+    Args:
+        architecture (str): 'conv' for Embedding -> Conv1D -> global max pooling,
+            'rnn' for a smaller copy of the production SimpleRNN.
+        vocabulary_size (int): Embedding rows.
+        dimension (int): Embedding size.
+        units (int): Recurrent units of the 'rnn' student.
+        filters (int): Convolution filters of the 'conv' student.
+        kernel_size (int): Convolution width in tokens of the 'conv' student.
+
+    Returns:
+        keras.Model: Compiled model mapping pre-padded ids to a positive-sentiment probability.
+    """
+    if architecture == 'rnn':
+        return build_model(vocabulary_size, dimension, units)
+    if architecture != 'conv':
+        raise ValueError(f"Unknown student architecture: {architecture}")
+
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Input, Embedding, Conv1D, GlobalMaxPooling1D, Dense
+
+    model = Sequential([
+        Input(shape=(None,), dtype='int32'),
+        Embedding(input_dim=vocabulary_size, output_dim=dimension),
+        Conv1D(filters, kernel_size, activation='relu'),
+        GlobalMaxPooling1D(),
+        Dense(1, activation='sigmoid'),
+    ])
+    model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+    return model
+
+def teacher_agreement(y_true, y_pred):
+    """Share of reviews on the same side of 0.5 as the (soft) target, `accuracy` needs hard labels."""
+    from tensorflow.keras import ops
+
+    return ops.mean(ops.cast(ops.equal(y_true > 0.5, y_pred > 0.5), 'float32'))
+
+def _teacher_cache_key(sequences: list, teacher: str) -> str:
+    """Identifies the teacher file version, the scoring mode and the exact token sequences."""
+    from config import sentiment_models, long_review_chunking, long_review_chunk_len
+
+    stat = os.stat(sentiment_models[teacher])
+    digest = hashlib.sha1(f"{teacher}|{stat.st_size}|{stat.st_mtime_ns}|"
+                          f"{long_review_chunking}|{long_review_chunk_len}|{len(sequences)}".encode('utf-8'))
+    for seq in sequences:
+        seq = np.asarray(seq, dtype=np.int64)
+        digest.update(np.int64(len(seq)).tobytes())
+        digest.update(seq.tobytes())
+    return digest.hexdigest()
+
+def teacher_scores(sequences: list, teacher: str = 'rnn', cache_path: str = None) -> np.ndarray:
+    """
+    Scores of the teacher model for every sequence, read from `cache_path` if it matches.
+
+    The cache is keyed on the teacher's model file (size and modification time),
+    the long-review scoring mode and a hash of the sequences, so a retrained
+    teacher or a different dataset of the same size is scored again.
+
+    Args:
+        sequences (list): Token id sequences.
+        teacher (str): Registered model name, see `sentiment_models` in the config.
+        cache_path (str): Optional .npz file the scores are read from / written to.
+
+    Returns:
+        np.ndarray: Positive-sentiment probability for every sequence.
+    """
+    key = _teacher_cache_key(sequences, teacher) if cache_path else None
+    if cache_path and os.path.exists(cache_path):
+        with np.load(cache_path) as cached:
+            if 'key' in cached and str(cached['key']) == key:
+                return cached['scores']
+        print(f"[Warning] Ignoring teacher scores in {cache_path}, they belong to another teacher or dataset.")
+
+    from utils.predict_sentiment import rnn_scores
+
+    start = time.perf_counter()
+    scores = rnn_scores([list(seq) for seq in sequences], model_name=teacher)
+    print(f"Teacher scored {len(scores)} reviews in {time.perf_counter() - start:.1f}s")
+
+    if cache_path:
+        np.savez(cache_path, scores=scores, teacher=teacher, key=key)
+    return scores
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill the sentiment RNN into a compact student model.")
+    parser.add_argument('--data', default=None, help="Local imdb.npz or labelled CSV (downloads the keras dataset if omitted).")
+    parser.add_argument('--word-index', default=None,
+                        help="Local imdb_word_index.json, tokenizes CSV data and goes into the vocabulary artifact.")
+    parser.add_argument('--teacher', default='rnn', help="Registered teacher model name.")
+    parser.add_argument('--teacher-scores', default='./models/teacher_scores.npz',
+                        help="Cache of the teacher's scores, empty string disables it.")
+    parser.add_argument('--alpha', type=float, default=1.0,
+                        help="Weight of the teacher score in the target, the rest goes to the true label.")
+    parser.add_argument('--architecture', choices=['conv', 'rnn'], default='conv')
+    parser.add_argument('--dimension', type=int, default=64)
+    parser.add_argument('--units', type=int, default=32)
+    parser.add_argument('--filters', type=int, default=64)
+    parser.add_argument('--kernel-size', type=int, default=5)
+    parser.add_argument('--max-len', type=int, default=1000)
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--validation-split', type=float, default=0.2)
+    parser.add_argument('--early-stopping', type=int, default=2, help="Patience on val_loss, 0 disables it.")
+    parser.add_argument('--output-root', default='./models/runs')
+    parser.add_argument('--name', default='imdb_student')
+    parser.add_argument('--export', action='store_true',
+                        help="Also copy the model to the 'student' path registered in the config.")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    import tensorflow as tf
+    from config import sentiment_models
+
+    tf.keras.utils.set_random_seed(args.seed)
+
+    sequences, labels = load_imdb(args.data, word_index_path=args.word_index)
+    soft = teacher_scores(sequences, args.teacher, args.teacher_scores or None)
+    targets = args.alpha * soft + (1 - args.alpha) * labels
+
+    # same split as train_rnn, the validation part is what the comparison report should use
+    (X_train, t_train), (X_val, t_val) = train_test_split(sequences, targets, test_size=args.validation_split, seed=args.seed)
+    _, (_, y_val) = train_test_split(sequences, labels, test_size=args.validation_split, seed=args.seed)
+    _, (_, soft_val) = train_test_split(sequences, soft, test_size=args.validation_split, seed=args.seed)
+    print(f"Distilling on {len(t_train)} reviews ({len(t_val)} validation)")
+
+    # Conv1D drops the embedding mask, the conv student sees padding exactly like at inference
+    pad_to_max_len = args.architecture == 'conv'
+    train_data = bucketed_dataset(X_train, t_train, args.batch_size, args.max_len, seed=args.seed,
+                                  pad_to_max_len=pad_to_max_len)
+    val_data = bucketed_dataset(X_val, t_val, args.batch_size, args.max_len, shuffle=False,
+                                pad_to_max_len=pad_to_max_len)
+
+    model = build_student(args.architecture, VOCABULARY_SIZE, args.dimension, args.units, args.filters, args.kernel_size)
+    model.compile(optimizer='adam', loss='binary_crossentropy', metrics=[teacher_agreement])
+    throughput = _throughput_callback()(len(t_train))
+    callbacks = [throughput]
+    if args.early_stopping:
+        callbacks.append(tf.keras.callbacks.EarlyStopping(
+            monitor='val_loss', patience=args.early_stopping, restore_best_weights=True
+        ))
+
+    start = time.perf_counter()
+    history = model.fit(train_data, validation_data=val_data, epochs=args.epochs, callbacks=callbacks, verbose=2)
+    training_seconds = time.perf_counter() - start
+
+    # accuracy and agreement with the teacher on the held-out part, padded like at inference
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+    padded_val = pad_sequences(X_val, maxlen=args.max_len, padding='pre')
+    val_scores = model.predict(padded_val, batch_size=256, verbose=0).reshape(-1)
+
+    run_dir = make_run_dir(args.output_root, args.name)
+    model_path = os.path.join(run_dir, 'model.keras')
+    model.save(model_path)
+    write_vocabulary(os.path.join(run_dir, 'vocabulary.json'), args.word_index, VOCABULARY_SIZE)
+
+    history_df = pd.concat([pd.DataFrame(history.history), pd.DataFrame(throughput.epochs)], axis=1)
+    history_df.to_csv(os.path.join(run_dir, 'training_history.csv'), index=False)
+
+    report = {
+        'config': vars(args),
+        'tensorflow_version': tf.__version__,
+        'parameters': int(model.count_params()),
+        'train_reviews': len(t_train),
+        'validation_reviews': len(t_val),
+        'training_seconds': training_seconds,
+        'mean_train_reviews_per_s': float(np.mean([e['reviews_per_s'] for e in throughput.epochs])),
+        'validation_accuracy': float(np.mean((val_scores > 0.5) == y_val)),
+        'validation_teacher_agreement': float(np.mean((val_scores > 0.5) == (soft_val > 0.5))),
+        'final': {k: float(v[-1]) for k, v in history.history.items()},
+    }
+    with open(os.path.join(run_dir, 'report.json'), 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+
+    print(history_df.round(4).to_string())
+    print(f"Student: {report['parameters']:,} parameters, validation accuracy {report['validation_accuracy']:.4f}")
+    print(f"Saved model, vocabulary and report to {run_dir}")
+
+    if args.export:
+        shutil.copyfile(model_path, sentiment_models['student'])
+        print(f"Exported the student to {sentiment_models['student']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+VOCABULARY_SIZE = 20000  # same vocabulary the RNN was trained with
+
+# keras.datasets.imdb conventions, shared with `encode_review`
+START_CHAR = 1
+OOV_CHAR = 2
+INDEX_FROM = 3
+
+def load_word_index(path: str = None) -> dict:
+    """Raw keras IMDB word -> rank mapping from a local `imdb_word_index.json`, downloaded if None."""
+    if path:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    from tensorflow.keras.datasets import imdb
+    return imdb.get_word_index()
+
+def encode_text(text: str, word_index: dict) -> list[int]:
+    """Tokenize like `encode_review`: lower-cased words, <START> first, unknown words as <UNK>."""
+    encoded = [START_CHAR]
+    for word in text.lower().split():
+        rank = word_index.get(word)
+        encoded.append(rank + INDEX_FROM if rank is not None else OOV_CHAR)
+    return encoded
+
+def _clip_vocabulary(sequences: list, num_words: int) -> list[np.ndarray]:
+    return [np.where(seq < num_words, seq, OOV_CHAR) for seq in sequences]
+
+def _load_npz(path: str, num_words: int) -> tuple:
+    # raw keras `imdb.npz` layout: word ranks starting at 1, no start token
+    with np.load(path, allow_pickle=True) as data:
+        raw = np.concatenate([data['x_train'], data['x_test']])
+        labels = np.concatenate([data['y_train'], data['y_test']])
+
+    sequences = [
+        np.concatenate(([START_CHAR], np.asarray(x, dtype=np.int64) + INDEX_FROM))
+        for x in raw
+    ]
+    return _clip_vocabulary(sequences, num_words), labels.astype(np.int64)
+
+def _load_csv(path: str, num_words: int, word_index_path: str = None) -> tuple:
+    # plain-text reviews, e.g. the 50k "IMDB Dataset.csv" with review/sentiment columns
+    df = pd.read_csv(path)
+    if 'review' not in df.columns or 'sentiment' not in df.columns:
+        raise KeyError("CSV sample must have 'review' and 'sentiment' columns.")
+
+    labels = df['sentiment'].astype(str).str.lower().map({'positive': 1, 'negative': 0, '1': 1, '0': 0})
+    if labels.isna().any():
+        raise ValueError("Sentiment labels must be positive/negative or 1/0.")
+
+    word_index = load_word_index(word_index_path)
+    sequences = [np.asarray(encode_text(text, word_index), dtype=np.int64) for text in df['review'].astype(str)]
+    return _clip_vocabulary(sequences, num_words), labels.to_numpy(dtype=np.int64)
+
+def load_imdb(path: str = None, num_words: int = VOCABULARY_SIZE, word_index_path: str = None) -> tuple:
+    """
+    Load labelled IMDB reviews as token id sequences.
+
+    Args:
+        path (str): Local `.npz` file in keras `imdb.npz` layout or a `.csv` file
+            with 'review' and 'sentiment' columns. Downloads the keras dataset if None.
+        num_words (int): Ids at or above this value are mapped to the <UNK> id.
+        word_index_path (str): Local `imdb_word_index.json` CSV reviews are tokenized
+            with, downloaded through keras if None.
+
+    Returns:
+        tuple: (sequences, labels) with a list of int64 arrays and an int64 label array.
+    """
+    if path is None:
+        from tensorflow.keras.datasets import imdb
+
+        (X_train, y_train), (X_test, y_test) = imdb.load_data(num_words=num_words)
+        sequences = [np.asarray(x, dtype=np.int64) for x in np.concatenate((X_train, X_test))]
+        return sequences, np.concatenate((y_train, y_test)).astype(np.int64)
+
+    if path.endswith('.npz'):
+        return _load_npz(path, num_words)
+    if path.endswith('.csv'):
+        return _load_csv(path, num_words, word_index_path)
+    raise ValueError(f"Unsupported dataset file: {path}")
+
+def train_test_split(sequences: list, labels: np.ndarray, test_size: float = 0.2, seed: int = 42) -> tuple:
+    """Shuffle and split sequences/labels, returns (X_train, y_train), (X_test, y_test)."""
+    order = np.random.default_rng(seed).permutation(len(labels))
+    n_test = int(len(labels) * test_size)
+    test_idx, train_idx = order[:n_test], order[n_test:]
+    return (
+        ([sequences[i] for i in train_idx], labels[train_idx]),
+        ([sequences[i] for i in test_idx], labels[test_idx]),
+    )
+
+def _pre_pad(tokens, lengths):
+    # bucketing pads at the end, the models are trained (and served) with padding in front:
+    # reversing the valid prefix and then the whole row moves the zeros to the front
+    import tensorflow as tf
+
+    return tf.reverse(tf.reverse_sequence(tokens, lengths, seq_axis=1, batch_axis=0), axis=[1])
+
+def bucketed_dataset(sequences: list, labels: np.ndarray, batch_size: int = 64, max_len: int = 1000,
+                     bucket_boundaries: list[int] = None, shuffle: bool = True, seed: int = 42,
+                     pad_to_max_len: bool = False):
+    """
+    Length-bucketed, cached and prefetched tf.data pipeline over token id sequences.
+
+    Reviews are kept ragged (no up-front padding to `max_len`), grouped into
+    batches of similar length and pre-padded only to the longest review of
+    their batch. Reviews longer than `max_len` keep their last `max_len` ids,
+    the same truncation `pad_sequences` applies at inference.
+
+    Inference always pre-pads to `max_len`, so short padding is only safe for
+    models that mask the padding id 0 (`Embedding(mask_zero=True)` followed by
+    mask-aware layers, as in `train_rnn.build_model`). Other models need
+    `pad_to_max_len`, which keeps the bucketing but pads every batch like inference.
+
+    Args:
+        sequences (list): Token id sequences.
+        labels (np.ndarray): Targets, 0/1 labels or teacher scores.
+        batch_size (int): Reviews per batch.
+        max_len (int): Maximum review length in tokens.
+        bucket_boundaries (list): Length boundaries between buckets.
+        shuffle (bool): Reshuffle every epoch.
+        seed (int): Shuffling seed.
+        pad_to_max_len (bool): Pre-pad every batch to `max_len` instead of its longest review.
+
+    Returns:
+        tf.data.Dataset: Batches of (pre-padded ids, labels).
+    """
+    import tensorflow as tf
+
+    if bucket_boundaries is None:
+        bucket_boundaries = [b for b in (64, 128, 256, 384, 512, 768) if b < max_len]
+
+    truncated = [np.asarray(seq, dtype=np.int32)[-max_len:] for seq in sequences]
+    lengths = np.fromiter((len(seq) for seq in truncated), dtype=np.int64, count=len(truncated))
+    ragged = tf.RaggedTensor.from_row_lengths(np.concatenate(truncated), lengths)
+
+    dataset = tf.data.Dataset.from_tensor_slices((ragged, np.asarray(labels, dtype=np.float32))).cache()
+    if shuffle:
+        dataset = dataset.shuffle(min(len(truncated), 10000), seed=seed, reshuffle_each_iteration=True)
+
+    dataset = dataset.map(lambda tokens, label: (tokens, tf.shape(tokens)[0], label))
+    dataset = dataset.bucket_by_sequence_length(
+        element_length_func=lambda tokens, length, label: length,
+        bucket_boundaries=bucket_boundaries,
+        bucket_batch_sizes=[batch_size] * (len(bucket_boundaries) + 1),
+    )
+    dataset = dataset.map(
+        lambda tokens, lengths, label: (_pre_pad(tokens, lengths), label),
+        num_parallel_calls=tf.data.AUTOTUNE,
+    )
+    if pad_to_max_len:
+        dataset = dataset.map(
+            lambda tokens, label: (tf.pad(tokens, [[0, 0], [max_len - tf.shape(tokens)[1], 0]]), label),
+            num_parallel_calls=tf.data.AUTOTUNE,
+        )
+    return dataset.prefetch(tf.data.AUTOTUNE)
@@ -0,0 +1,67 @@
+"""
+Throughput and latency of concurrent scoring, with and without the shared inference worker.
+
+Each simulated session is a thread that repeatedly scores a small batch of
+synthetic reviews, like one "Perform Review Analysis" click. In `direct` mode
+every thread calls the model itself; in `worker` mode requests go through the
+queue and are merged into micro-batches.
+
+Usage:
+    python -m scripts.inference_load_report --sessions 8 --requests 10 --reviews 5
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from scripts.predict_memory_report import _synthetic_texts
+from utils.predict_sentiment import encode_review, score_encoded, submit_encoded
+
+def _session(encoded_reviews: list, n_requests: int, score) -> list[float]:
+    latencies = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        score(encoded_reviews)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def _run(mode: str, encoded_reviews: list, n_sessions: int, n_requests: int) -> dict:
+    if mode == 'direct':
+        score = lambda encoded: score_encoded(encoded, cascade=False)
+    else:
+        score = lambda encoded: submit_encoded(encoded, cascade=False).result()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_sessions) as pool:
+        results = list(pool.map(lambda _: _session(encoded_reviews, n_requests, score), range(n_sessions)))
+    elapsed = time.perf_counter() - start
+
+    latencies = np.concatenate(results)
+    return {
+        'mode': mode,
+        'reviews_per_s': n_sessions * n_requests * len(encoded_reviews) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'max_ms': float(latencies.max()),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent scoring with and without the inference worker.")
+    parser.add_argument('--sessions', type=int, default=8, help="Concurrent sessions (threads).")
+    parser.add_argument('--requests', type=int, default=10, help="Scoring requests per session.")
+    parser.add_argument('--reviews', type=int, default=5, help="Reviews per request.")
+    parser.add_argument('--words', type=int, default=200, help="Words per synthetic review.")
+    args = parser.parse_args()
+
+    encoded_reviews = [encode_review(text) for text in _synthetic_texts(args.reviews, args.words)]
+    score_encoded(encoded_reviews, cascade=False)  # trace the model before timing
+
+    print(f"{args.sessions} sessions x {args.requests} requests x {args.reviews} reviews")
+    for mode in ('direct', 'worker'):
+        row = _run(mode, encoded_reviews, args.sessions, args.requests)
+        print(f"{row['mode']:>7}: {row['reviews_per_s']:8.1f} reviews/s | p50 {row['p50_ms']:7.1f} ms | "
+              f"p95 {row['p95_ms']:7.1f} ms | max {row['max_ms']:7.1f} ms")
+
+if __name__ == '__main__':
+    main()
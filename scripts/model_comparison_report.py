@@ -0,0 +1,63 @@
+"""
+Side-by-side comparison of the registered sentiment models on a labelled local sample.
+
+Every model scores the same held-out reviews (the validation split of
+`distill_student` and `train_rnn`). The report shows accuracy, agreement with
+the reference model and CPU throughput.
+
+Usage:
+    python -m scripts.model_comparison_report --data path/to/imdb.npz --models rnn student --sample-size 2000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.imdb_data import load_imdb, train_test_split
+from utils.predict_sentiment import rnn_scores, get_model, sentiment_labels
+
+def _row(name, scores, elapsed, y, reference_scores):
+    labels = sentiment_labels(scores)
+    decided = labels != "NEUTRAL"
+    return {
+        'model': name,
+        'parameters': get_model(name).count_params(),
+        'accuracy': float(np.mean((scores > 0.5) == y)),
+        'accuracy_non_neutral': float(np.mean((scores[decided] > 0.5) == y[decided])) if decided.any() else float('nan'),
+        'agreement': float(np.mean(labels == sentiment_labels(reference_scores))),
+        'binary_agreement': float(np.mean((scores > 0.5) == (reference_scores > 0.5))),
+        'reviews_per_s': len(y) / elapsed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy/agreement/throughput report of the registered sentiment models.")
+    parser.add_argument('--data', default=None, help="Local imdb.npz or labelled CSV (downloads the keras dataset if omitted).")
+    parser.add_argument('--models', nargs='+', default=['rnn', 'student'],
+                        help="Registered model names, the first one is the agreement reference.")
+    parser.add_argument('--sample-size', type=int, default=2000)
+    parser.add_argument('--output', default=None, help="Optional CSV path for the report.")
+    args = parser.parse_args()
+
+    sequences, labels = load_imdb(args.data)
+    _, (X, y) = train_test_split(sequences, labels)
+    X, y = [list(x) for x in X[:args.sample_size]], y[:args.sample_size]
+    print(f"Scoring {len(y)} labelled reviews")
+
+    scores = {}
+    timings = {}
+    for name in args.models:
+        rnn_scores(X[:8], model_name=name)  # load the model and trace the graph before timing
+        start = time.perf_counter()
+        scores[name] = rnn_scores(X, model_name=name)
+        timings[name] = time.perf_counter() - start
+
+    reference = scores[args.models[0]]
+    report = pd.DataFrame([_row(name, scores[name], timings[name], y, reference) for name in args.models]).round(4)
+    print(report.to_string(index=False))
+    if args.output:
+        report.to_csv(args.output, index=False)
+        print(f"Saved report to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Measure peak RSS of `predict_arrays` for a batch of reviews under different memory budgets.
+
+Every configuration runs in a fresh process so its peak RSS is not hidden by
+an earlier, larger run. With `--max-rss-mb` the script exits with an error if
+any budgeted run goes over that limit; `tests/test_predict_memory.py` runs
+the same check under pytest.
+
+Usage:
+    python -m scripts.predict_memory_report --reviews 5000 --budgets 64 256 1e6 --max-rss-mb 2048
+    python -m scripts.predict_memory_report --reviews 500 --words 5000 --budgets 64 --truncate-long
+"""
+import argparse
+import multiprocessing
+import resource
+import sys
+import time
+
+import numpy as np
+
+def _synthetic_texts(n_reviews: int, words_per_review: int, seed: int = 0) -> list[str]:
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(['good', 'bad', 'great', 'boring', 'plot', 'acting', 'the', 'film', 'was', 'not'])
+    return [' '.join(rng.choice(vocabulary, words_per_review)) for _ in range(n_reviews)]
+
+def _run(n_reviews: int, words_per_review: int, budget_mb: float, chunk_long: bool, queue) -> None:
+    import config
+    config.long_review_chunking = chunk_long  # read when predict_sentiment is imported
+    from utils.predict_sentiment import predict_arrays
+
+    texts = _synthetic_texts(n_reviews, words_per_review)
+    baseline_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    scores, _ = predict_arrays(texts, cascade=False, memory_budget_mb=budget_mb)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # ru_maxrss is in KiB on Linux
+    queue.put({'budget_mb': budget_mb, 'peak_rss_mb': peak_mb, 'baseline_mb': baseline_mb,
+               'seconds': elapsed, 'reviews_per_s': len(scores) / elapsed})
+
+def check_budgets(n_reviews: int, words_per_review: int, budgets: list[float], max_rss_mb: float = None,
+                  chunk_long: bool = True) -> tuple:
+    """
+    Score a synthetic batch once per budget, each in a fresh process, and print the peak RSS.
+
+    Args:
+        n_reviews (int): Synthetic reviews per run.
+        words_per_review (int): Words per synthetic review.
+        budgets (list): Memory budgets in MB, a value of 1e6 or more means a single unchunked call.
+        max_rss_mb (float): Runs with a budget below 1e6 MB fail if their peak RSS is above this.
+        chunk_long (bool): Score reviews over 1000 tokens in chunks instead of truncating them.
+
+    Returns:
+        tuple: (results, failed) with one result dict per finished run.
+    """
+    context = multiprocessing.get_context('spawn')
+    results, failed = [], False
+    for budget in budgets:
+        queue = context.Queue()
+        process = context.Process(target=_run, args=(n_reviews, words_per_review, budget, chunk_long, queue))
+        process.start()
+        process.join()
+
+        if process.exitcode != 0:
+            # an unchunked batch can simply be killed by the OOM killer
+            print(f"budget {budget:>10.0f} MB | process died with exit code {process.exitcode}")
+            failed = failed or budget < 1e6
+            continue
+
+        result = queue.get()
+        results.append(result)
+
+        print(f"budget {budget:>10.0f} MB | peak RSS {result['peak_rss_mb']:8.0f} MB "
+              f"(before scoring {result['baseline_mb']:.0f} MB) | {result['reviews_per_s']:8.1f} reviews/s")
+        if max_rss_mb and budget < 1e6 and result['peak_rss_mb'] > max_rss_mb:
+            print(f"  peak RSS above the {max_rss_mb:.0f} MB limit")
+            failed = True
+
+    return results, failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of chunked predict() under memory budgets.")
+    parser.add_argument('--reviews', type=int, default=5000)
+    parser.add_argument('--words', type=int, default=300, help="Words per synthetic review.")
+    parser.add_argument('--budgets', type=float, nargs='+', default=[64, 256, 1e6],
+                        help="Memory budgets in MB, a huge value means a single unchunked call.")
+    parser.add_argument('--max-rss-mb', type=float, default=None,
+                        help="Fail if a run with a budget below 1e6 MB peaks above this RSS.")
+    parser.add_argument('--truncate-long', action='store_true',
+                        help="Score reviews over 1000 tokens on their last 1000 tokens instead of in chunks.")
+    args = parser.parse_args()
+
+    _, failed = check_budgets(args.reviews, args.words, args.budgets, args.max_rss_mb, not args.truncate_long)
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Pre-warm the OMDb, poster and review-analysis caches for popular or new titles.
+
+Titles come from a file (one imdbID or title per line) and/or the app's query
+log. Each run prints what was refreshed, how long it took and the cache hit
+rate of the logged requests before and after.
+
+Usage:
+    python -m scripts.prewarm --titles popular.txt --titles-per-minute 6
+    python -m scripts.prewarm --from-log --top 200 --days 7 --every-minutes 60
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from config import prewarm_stale_hours, prewarm_titles_per_minute, prewarm_top_titles
+from utils.prewarm import prewarm, cache_hit_rate, IMDB_ID
+from utils.query_log import popular_titles, requested_titles
+
+def _read_titles(path: str) -> list[str]:
+    with open(path, 'r', encoding='utf-8') as file:
+        return [line.strip() for line in file if line.strip() and not line.startswith('#')]
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-warm the caches the dashboard reads.")
+    parser.add_argument('--titles', default=None, help="File with one imdbID or title per line.")
+    parser.add_argument('--from-log', action='store_true', help="Add the most requested titles of the query log.")
+    parser.add_argument('--top', type=int, default=prewarm_top_titles, help="Titles taken from the query log.")
+    parser.add_argument('--days', type=float, default=7, help="Query log window in days.")
+    parser.add_argument('--stale-hours', type=float, default=prewarm_stale_hours)
+    parser.add_argument('--titles-per-minute', type=float, default=prewarm_titles_per_minute)
+    parser.add_argument('--every-minutes', type=float, default=0, help="Repeat on this cadence, 0 runs once.")
+    parser.add_argument('--output', default=None, help="Optional CSV path for the run report.")
+    args = parser.parse_args()
+
+    if not args.titles and not args.from_log:
+        parser.error("give --titles and/or --from-log")
+
+    while True:
+        entries = _read_titles(args.titles) if args.titles else []
+        if args.from_log:
+            entries += popular_titles(args.days, args.top)
+        entries = list(dict.fromkeys(entries))
+
+        # hit rate over the logged requests, or over the listed imdbIDs without a query log;
+        # the same ids before and after the run
+        requested = requested_titles(args.days)
+        measured = requested or [e for e in entries if IMDB_ID.match(e)]
+        before = cache_hit_rate(measured, args.stale_hours) if measured else None
+
+        start = time.perf_counter()
+        report = pd.DataFrame(prewarm(entries, args.stale_hours, args.titles_per_minute))
+        elapsed = time.perf_counter() - start
+
+        if not report.empty:
+            print(report[['entry', 'imdbID', 'title', 'status', 'new_reviews', 'seconds']].to_string(index=False))
+            refreshed = report['status'].isin(['analyzed', 'refreshed']).sum()
+            print(f"{len(report)} titles, {refreshed} refreshed in {elapsed:.1f}s")
+            if args.output:
+                report.to_csv(args.output, index=False)
+        else:
+            print("no titles to pre-warm")
+
+        if measured:
+            after = cache_hit_rate(measured, args.stale_hours)
+            source = "logged requests" if requested else "listed titles"
+            print(f"cache hit rate over {len(measured)} {source}: {before:.1%} before, {after:.1%} after")
+
+        if not args.every_minutes:
+            break
+        time.sleep(args.every_minutes * 60)
+
+if __name__ == '__main__':
+    main()
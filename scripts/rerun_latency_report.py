@@ -0,0 +1,106 @@
+"""
+Measure dashboard rerun latency for a movie that has already been analyzed.
+
+The app is driven headlessly with Streamlit's AppTest. Search results and a
+scored analysis are seeded into the session, so no network calls or model
+inference are needed. Each Previous/Next click and each rerun of the whole
+script is timed. The app's caches and query log are redirected to a temporary
+directory, the real `./cache` is left untouched.
+
+AppTest always executes the whole script, also for clicks inside a fragment,
+so the page flip numbers are an upper bound of what a browser session sees.
+
+Usage:
+    python -m scripts.rerun_latency_report --reviews 25 --repeats 10
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+# complete OMDb details, so the app shows them as they are and does not look them up
+MOVIES = [
+    {'imdbID': f'tt{i:07d}', 'Title': f'Movie {i}', 'Year': str(2000 + i), 'Rated': 'PG-13',
+     'Released': f'01 Jan {2000 + i}', 'Runtime': '120 min', 'Genre': 'Drama', 'Director': 'Someone',
+     'Writer': 'Someone Else', 'Actors': 'An Actor, Another Actor', 'Plot': 'A plot.', 'Language': 'English',
+     'Country': 'USA', 'Awards': 'N/A', 'Poster': 'N/A', 'Ratings': [], 'Metascore': '70',
+     'imdbRating': '7.0', 'imdbVotes': '1,000', 'Type': 'movie', 'BoxOffice': 'N/A', 'Response': 'True'}
+    for i in range(1, 4)
+]
+
+# everything the app writes below ./cache
+CACHE_PATHS = {
+    'omdb_cache_dir': 'omdb', 'title_index_dir': 'title_index', 'analysis_cache_dir': 'analysis',
+    'warehouse_dir': 'warehouse', 'image_cache_dir': 'images', 'query_log_path': 'query_log.jsonl',
+    'profile_dir': 'profiles',
+}
+
+def _use_cache_dir(cache_dir: str) -> None:
+    """Point the app's caches and query log at `cache_dir`, before any app module imports them."""
+    import config
+    for name, relative in CACHE_PATHS.items():
+        setattr(config, name, os.path.join(cache_dir, relative))
+
+def _seed_analysis(n_reviews: int, seed: int = 0) -> dict:
+    from utils.review_aggregates import aggregate_reviews
+    from utils.predict_sentiment import sentiment_labels
+
+    rng = np.random.default_rng(seed)
+    scores = np.round(rng.random(n_reviews), 4)
+    words = np.array(['good', 'bad', 'great', 'boring', 'plot', 'acting', 'the', 'film', 'was', 'not'])
+    reviews = [
+        {'review_id': f'rw{i}', 'date': None, 'rating': '7', 'title': 'A review title',
+         'content': ' '.join(rng.choice(words, int(rng.integers(50, 400)))),
+         'score': float(score), 'sentiment': label}
+        for i, (score, label) in enumerate(zip(scores, sentiment_labels(scores)))
+    ]
+    return {'imdbID': MOVIES[0]['imdbID'], 'reviews': reviews,
+            'aggregates': aggregate_reviews(reviews), 'last_crawl': '2026-01-01T00:00:00'}
+
+def _timed(action) -> float:
+    start = time.perf_counter()
+    action()
+    return (time.perf_counter() - start) * 1000
+
+def _report(n_reviews: int, repeats: int) -> None:
+    from streamlit.testing.v1 import AppTest
+
+    analysis = _seed_analysis(n_reviews)
+    at = AppTest.from_file('app/main.py', default_timeout=120)
+    at.session_state['movies'] = MOVIES
+    at.session_state['reviews'] = {analysis['imdbID']: analysis['reviews']}
+    at.session_state['full_analysis'] = {analysis['imdbID']: analysis}
+    at.run()  # first run loads the model and warms the caches
+
+    def click(label):
+        button = next(b for b in at.button if label in b.label)
+        button.click().run()
+
+    full, pages = [], []
+    for _ in range(repeats):
+        full.append(_timed(at.run))
+        pages.append(_timed(lambda: click('Next')))   # analyzed -> next movie
+        pages.append(_timed(lambda: click('Previous')))  # back to the analyzed movie
+
+    for name, samples in [("full rerun", full), ("page flip", pages)]:
+        print(f"{name:>10}: median {statistics.median(samples):7.1f} ms | "
+              f"p90 {np.percentile(samples, 90):7.1f} ms | n={len(samples)}")
+
+    if at.exception:
+        print(f"App raised: {at.exception}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Rerun latency of the dashboard after analysis.")
+    parser.add_argument('--reviews', type=int, default=25)
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        _use_cache_dir(cache_dir)
+        _report(args.reviews, args.repeats)
+
+if __name__ == '__main__':
+    main()
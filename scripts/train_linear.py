@@ -0,0 +1,52 @@
+"""
+Train the hashed n-gram logistic regression used as the first cascade stage.
+
+Usage:
+    python -m scripts.train_linear --data path/to/imdb.npz --output models/imdb_linear_ngram.npz
+"""
+import argparse
+import time
+
+import numpy as np
+
+from scripts.imdb_data import VOCABULARY_SIZE, load_imdb, train_test_split
+from utils.linear_sentiment import train_linear_model, linear_scores, save_linear_model
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the fast hashed n-gram sentiment model.")
+    parser.add_argument('--data', default=None, help="Local imdb.npz or labelled CSV (downloads the keras dataset if omitted).")
+    parser.add_argument('--output', default='./models/imdb_linear_ngram.npz')
+    parser.add_argument('--n-bits', type=int, default=20)
+    parser.add_argument('--ngram', type=int, default=2, choices=[1, 2])
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--learning-rate', type=float, default=0.1)
+    parser.add_argument('--test-size', type=float, default=0.2)
+    args = parser.parse_args()
+
+    sequences, labels = load_imdb(args.data, num_words=VOCABULARY_SIZE)
+    (X_train, y_train), (X_test, y_test) = train_test_split(sequences, labels, test_size=args.test_size)
+    print(f"Loaded {len(labels)} reviews ({len(y_train)} train / {len(y_test)} test)")
+
+    start = time.perf_counter()
+    linear_model = train_linear_model(
+        X_train, y_train,
+        n_bits=args.n_bits,
+        ngram=args.ngram,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        learning_rate=args.learning_rate,
+        vocabulary_size=VOCABULARY_SIZE,
+    )
+    print(f"Training time : {time.perf_counter() - start:.1f}s")
+
+    for name, X, y in [("Train", X_train, y_train), ("Test", X_test, y_test)]:
+        if len(y):
+            accuracy = np.mean((linear_scores(X, linear_model) > 0.5) == y)
+            print(f"{name} accuracy : {accuracy:.4f}")
+
+    save_linear_model(args.output, linear_model)
+    print(f"Saved model to {args.output}")
+
+if __name__ == '__main__':
+    main()
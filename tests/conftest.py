@@ -0,0 +1,9 @@
+import os
+import sys
+
+# the app imports its modules relative to app/ and reads ./models, ./cache from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, 'app')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+os.chdir(ROOT)
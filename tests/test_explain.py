@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pytest
+
+from config import sentiment_models, sentiment_model
+
+pytestmark = pytest.mark.skipif(not os.path.exists(sentiment_models[sentiment_model]),
+                                reason="sentiment model file not available")
+
+REVIEW = {'title': "great", 'content': "film but dull ending"}
+
+@pytest.fixture
+def routed(monkeypatch):
+    """Fake cascade: the full review and shorter variants land on opposite sides of the band."""
+    try:
+        from utils import predict_sentiment
+    except RuntimeError as e:  # word index or model could not be loaded, e.g. offline
+        pytest.skip(str(e))
+    n_words = len((REVIEW['title'] + " " + REVIEW['content']).split())
+    monkeypatch.setattr(predict_sentiment, 'fast_model', {'vocabulary_size': 20000})
+    monkeypatch.setattr(predict_sentiment, 'inference_batching', False)
+    monkeypatch.setattr(predict_sentiment, 'rnn_scores',
+                        lambda reviews, *args, **kwargs: np.array([len(r) / 100 for r in reviews], dtype=np.float32))
+
+    def use(original: float, variant: float):
+        def fast_scores(reviews):
+            return np.array([original if len(r) == n_words + 1 else variant for r in reviews], dtype=np.float32)
+        monkeypatch.setattr(predict_sentiment, '_fast_scores', fast_scores)
+        return predict_sentiment.explain(REVIEW, cascade=True)
+    return use
+
+def test_explain_uses_rnn_for_all_variants_when_review_is_uncertain(routed):
+    explanation = routed(original=0.5, variant=0.95)
+    assert explanation['score'] == pytest.approx(0.06)
+    assert explanation['weights'] == pytest.approx([0.01] * 5)
+
+def test_explain_uses_linear_model_for_all_variants_when_review_is_confident(routed):
+    explanation = routed(original=0.95, variant=0.5)
+    assert explanation['score'] == pytest.approx(0.95)
+    assert explanation['weights'] == pytest.approx([0.45] * 5)
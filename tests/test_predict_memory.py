@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from config import predict_memory_budget_mb, sentiment_models, sentiment_model
+from scripts.predict_memory_report import check_budgets
+
+N_REVIEWS, WORDS = 200, 300
+# budgets are estimates of the activations, allow this much RSS growth per MB of budget
+OVERHEAD_FACTOR = 1.5
+# large enough to score the whole batch in one call, still checked against the limit
+UNCHUNKED_MB = 1e5
+
+def _word_index_available() -> bool:
+    try:
+        import tensorflow as tf
+        tf.keras.datasets.imdb.get_word_index()
+        return True
+    except Exception:
+        return False
+
+pytestmark = [
+    pytest.mark.skipif(not os.path.exists(sentiment_models[sentiment_model]),
+                       reason="sentiment model file not available"),
+    pytest.mark.skipif(not _word_index_available(), reason="IMDB word index not available"),
+]
+
+@pytest.fixture(scope='module')
+def runs():
+    results, failed = check_budgets(N_REVIEWS, WORDS, [predict_memory_budget_mb, UNCHUNKED_MB])
+    assert not failed and len(results) == 2
+    budgeted, unchunked = results
+    limit_mb = budgeted['baseline_mb'] + predict_memory_budget_mb * OVERHEAD_FACTOR
+    return budgeted, unchunked, limit_mb
+
+def test_budgeted_peak_rss_within_limit(runs):
+    budgeted, _, limit_mb = runs
+    assert budgeted['peak_rss_mb'] <= limit_mb
+
+def test_unchunked_peak_rss_above_limit(runs):
+    # otherwise the batch is too small for the limit to tell chunked from unchunked scoring
+    _, unchunked, limit_mb = runs
+    assert unchunked['peak_rss_mb'] > limit_mb
+
+def test_max_rss_check_passes_at_configured_budget(runs):
+    _, _, limit_mb = runs
+    _, failed = check_budgets(N_REVIEWS, WORDS, [predict_memory_budget_mb], max_rss_mb=limit_mb)
+    assert not failed
+
+def test_max_rss_check_fails_above_limit(runs):
+    _, _, limit_mb = runs
+    _, failed = check_budgets(N_REVIEWS, WORDS, [UNCHUNKED_MB], max_rss_mb=limit_mb)
+    assert failed